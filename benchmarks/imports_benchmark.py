@@ -0,0 +1,50 @@
+"""
+Compares the ast based import extractor with the regex used before it, on every py file of a folder.
+
+    python benchmarks/imports_benchmark.py [folder] [--repeat N]
+
+The folder defaults to the standard library of the running python, a large tree of real code.
+"""
+from argparse import ArgumentParser
+from json import dumps
+from os.path import abspath, dirname
+from re import MULTILINE, compile
+from sysconfig import get_paths
+from time import perf_counter
+import sys
+sys.path.insert(0, dirname(dirname(abspath(__file__))))  # the get_requirements of this working tree, even if another one is installed
+from get_requirements.imports import extract_imports
+from get_requirements.walker import walk_py_files
+
+REGEX_PATTERN = compile(r'^(?!\s*#)\s*(?:from\s+(\S+)\s+import\s+\S+|import\s+(\S+))', MULTILINE)
+
+def regex_extract(source:bytes) -> list[str]:
+    data = source.decode('utf-8', errors='replace')
+    return [m.group(1) or m.group(2) for m in REGEX_PATTERN.finditer(data)]
+
+def ast_extract(source:bytes) -> list:
+    return extract_imports(source)
+
+def run(folder_path:str, repeat:int) -> dict:
+    sources = []
+    for file_path in walk_py_files(folder_path, use_default_excludes=False, use_gitignore=False):
+        with open(file_path, 'rb') as f:
+            sources.append(f.read())
+    results = {'folder_path': folder_path, 'files': len(sources), 'bytes': sum(len(s) for s in sources)}
+    for name, extract in (('regex', regex_extract), ('ast', ast_extract)):
+        best = None
+        for _ in range(repeat):
+            start = perf_counter()
+            for source in sources:
+                extract(source)
+            elapsed = perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[f'{name}_seconds'] = round(best, 4)
+    return results
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description="Compares the ast based import extractor with the old regex")
+    parser.add_argument("folder", nargs='?', default=get_paths()['stdlib'])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(dumps(run(args.folder, args.repeat), indent=2))
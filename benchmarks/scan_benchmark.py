@@ -0,0 +1,102 @@
+"""
+Measures each stage of the scan (discovery, read, extraction, standard modules classification and merge) on a synthetic tree, so
+changes to them can be compared across commits.
+
+    python benchmarks/scan_benchmark.py [--files N] [--file-size BYTES] [--imports N] [--depth N] [--test-ratio R] [--giant-files N]
+                                        [--giant-size BYTES] [--seed N] [--repeat N] [--folder FOLDER] [--output result.json]
+                                        [--compare baseline.json]
+
+The tree is generated in a temporary folder (or in --folder, kept between runs). The result is a json with the parameters, counts
+and the best and median seconds of each stage over --repeat runs. With --compare, the ratio of each stage to a previous result is
+printed too (above 1 is slower).
+"""
+from argparse import ArgumentParser
+from json import dump, dumps, load
+from os.path import abspath, dirname, exists
+from platform import python_version
+from statistics import median
+from subprocess import run, DEVNULL
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import sys
+sys.path.insert(0, dirname(dirname(abspath(__file__))))  # the get_requirements of this working tree, even if another one is installed
+from get_requirements.get_standard_python_libraries import get_standard_python_libraries
+from get_requirements.imports import extract_imports, get_top_level_modules
+from get_requirements.index import ModuleIndex
+from get_requirements.reader import read_source
+from get_requirements.walker import walk_py_files
+from synthetic_tree import generate_tree
+
+def _commit() -> str|None:
+    try:
+        return run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, stdin=DEVNULL).stdout.strip() or None
+    except OSError:
+        return None
+
+def _time(stage, repeat:int) -> tuple[dict, object]:
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        result = stage()
+        times.append(perf_counter() - start)
+    return {'best': round(min(times), 4), 'median': round(median(times), 4)}, result
+
+def _merge(file_paths:list[str], records:list, standard_modules:frozenset) -> ModuleIndex:
+    "fills a ModuleIndex and reads what the conversion to PackagesInfo reads (without pydantic, so only the merge is measured)"
+    index = ModuleIndex()
+    for file_path, file_records in zip(file_paths, records):
+        index.add_file(file_path, get_top_level_modules(file_records))
+    [(m in standard_modules, index.is_on_standard_files(m), index.module_files(m)) for m in index.modules]
+    return index
+
+def benchmark(folder_path:str, repeat:int = 3) -> dict:
+    "returns the seconds of each stage of the scan of `folder_path`"
+    stages = {}
+    stages['discovery'], file_paths = _time(lambda: list(walk_py_files(folder_path)), repeat)
+    stages['read'], sources = _time(lambda: [read_source(f) for f in file_paths], repeat)
+    stages['extraction'], records = _time(lambda: [extract_imports(s) for s in sources], repeat)
+    def classification():
+        get_standard_python_libraries.cache_clear()
+        return get_standard_python_libraries()
+    stages['classification'], standard_modules = _time(classification, repeat)
+    stages['merge'], index = _time(lambda: _merge(file_paths, records, standard_modules), repeat)
+    return {
+        'counts': {'files': len(file_paths), 'bytes': sum(len(s) for s in sources), 'imports': sum(len(r) for r in records), 'modules': len(index.modules)},
+        'stages': stages,
+        'total_best': round(sum(s['best'] for s in stages.values()), 4)
+    }
+
+def compare(result:dict, baseline:dict) -> dict[str, float]:
+    "returns the ratio of the best time of each stage of `result` to the one of `baseline`"
+    return {k:round(v['best'] / baseline['stages'][k]['best'], 2) for k,v in result['stages'].items() if baseline['stages'].get(k, {}).get('best')}
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description="Measures each stage of the scan on a synthetic tree")
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--file-size", type=int, default=4000)
+    parser.add_argument("--imports", type=int, default=10)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--test-ratio", type=float, default=0.2)
+    parser.add_argument("--giant-files", type=int, default=2)
+    parser.add_argument("--giant-size", type=int, default=5_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--folder", help="Folder of the tree, generated only if it doesn't exist. Default to a temporary folder")
+    parser.add_argument("--output", help="Path of the json result. Default to printing it")
+    parser.add_argument("--compare", help="Path of a previous json result to compare with")
+    args = parser.parse_args()
+    params = {k:v for k,v in vars(args).items() if k not in ('folder', 'output', 'compare')}
+    tree = dict(params)
+    tree.pop('repeat')
+    with TemporaryDirectory() as tmp_folder:
+        folder_path = args.folder or tmp_folder
+        if not args.folder or not exists(folder_path):
+            generate_tree(folder_path, **tree)
+        result = {'params': params, 'python': python_version(), 'commit': _commit(), **benchmark(folder_path, args.repeat)}
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            result['compared_to'] = {'commit': (baseline := load(f)).get('commit'), 'ratios': compare(result, baseline)}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            dump(result, f, indent=2)
+    print(dumps(result, indent=2))
@@ -0,0 +1,53 @@
+"""
+Measures the startup of the get_requirements console script: the import time of `get_requirements.cli` (from
+`python -X importtime`) and the wall time of `--check` on a small synthetic tree, so the lightweight path stays under a budget.
+
+    python benchmarks/startup_benchmark.py [--files N] [--repeat N] [--budget-ms MS] [--output result.json]
+
+Exits with 1 if the best wall time of `--check` is above --budget-ms.
+"""
+from argparse import ArgumentParser
+from json import dump, dumps
+from os.path import dirname, join
+from platform import python_version
+from statistics import median
+from subprocess import run, DEVNULL
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import sys
+from synthetic_tree import generate_tree
+
+ROOT = dirname(dirname(__file__)) or '.'
+
+def import_time(module:str = 'get_requirements.cli') -> dict:
+    "returns the cumulative import microseconds of `module` and the number of modules it imported, from `python -X importtime`"
+    stderr = run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], capture_output=True, text=True, stdin=DEVNULL, cwd=ROOT).stderr
+    rows = [line.split('|') for line in stderr.splitlines() if line.startswith('import time:') and 'cumulative' not in line]
+    cumulative = {row[2].strip():int(row[1]) for row in rows if len(row) == 3}
+    return {'module': module, 'cumulative_us': cumulative.get(module), 'modules': len(cumulative), 'heavy_modules': sorted(m for m in ('pydantic', 'cli_pprinter', 'file_handler') if m in cumulative)}
+
+def check_time(folder_path:str, repeat:int = 5) -> dict:
+    "returns the best and median wall seconds of `python -m get_requirements.cli --check` on `folder_path`"
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        run([sys.executable, '-m', 'get_requirements.cli', '--check', '-q', '-nr', '-f', folder_path], stdin=DEVNULL, cwd=ROOT)
+        times.append(perf_counter() - start)
+    return {'best': round(min(times), 4), 'median': round(median(times), 4)}
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description="Measures the startup of the get_requirements console script")
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=300)
+    parser.add_argument("--output", help="Path of the json result. Default to printing it")
+    args = parser.parse_args()
+    with TemporaryDirectory() as folder_path:
+        generate_tree(join(folder_path, 'tree'), files=args.files)
+        result = {'params': vars(args), 'python': python_version(), 'import': import_time(), 'check': check_time(join(folder_path, 'tree'), args.repeat)}
+    result['over_budget'] = result['check']['best'] * 1000 > args.budget_ms
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            dump(result, f, indent=2)
+    print(dumps(result, indent=2))
+    sys.exit(1 if result['over_budget'] else 0)
@@ -0,0 +1,81 @@
+"""
+Generates a synthetic source tree to benchmark the scan on, reproducibly (the same arguments and seed give the same files).
+
+    python benchmarks/synthetic_tree.py folder [--files N] [--file-size BYTES] [--imports N] [--depth N] [--test-ratio R]
+                                               [--giant-files N] [--giant-size BYTES] [--seed N]
+"""
+from argparse import ArgumentParser
+from os import makedirs
+from os.path import join
+from random import Random
+
+STANDARD_MODULES = ('os', 'sys', 'json', 're', 'typing', 'collections', 'itertools', 'functools', 'pathlib', 'datetime', 'logging', 'os.path', 'concurrent.futures', 'xml.etree.ElementTree')
+THIRD_PARTY_MODULES = tuple(f'package_{i}' for i in range(200)) + ('numpy', 'pandas', 'yaml', 'requests', 'google.protobuf', 'sklearn.linear_model')
+
+def _import_line(rng:Random) -> str:
+    kind = rng.random()
+    if kind < 0.1:
+        return f'from . import local_{rng.randrange(20)}'
+    module = rng.choice(STANDARD_MODULES if kind < 0.5 else THIRD_PARTY_MODULES)
+    if kind < 0.75:
+        return f'import {module}'
+    return f'from {module} import name_{rng.randrange(10)}, other_{rng.randrange(10)}'
+
+def _source(rng:Random, imports:int, size:int) -> str:
+    lines = ['"""synthetic module"""']
+    lines += [_import_line(rng) for _ in range(imports)]
+    if imports > 2:
+        lines.insert(3, 'try:\n    import ujson as json\nexcept ImportError:\n    import json')
+        lines.append('from typing import TYPE_CHECKING\nif TYPE_CHECKING:\n    from package_0 import Model')
+    i = 0
+    while sum(len(line) + 1 for line in lines) < size:
+        lines.append(f'\ndef function_{i}(value):\n    "returns value {i}"\n    result = [value * {i} for _ in range(10)]\n    return {{"import": result}}\n')
+        i += 1
+        if i % 20 == 0:
+            lines.append(f'class Class{i}:\n    def method(self):\n        import {rng.choice(THIRD_PARTY_MODULES)}\n        return None\n')
+    return '\n'.join(lines) + '\n'
+
+def generate_tree(folder_path:str, files:int = 1000, file_size:int = 4000, imports:int = 10, depth:int = 3, test_ratio:float = 0.2, giant_files:int = 0, giant_size:int = 5_000_000, seed:int = 0) -> list[str]:
+    """
+    Writes `files` py files (about `file_size` bytes and `imports` imports each, a `test_ratio` of them being test files) in folders
+    nested up to `depth` levels inside `folder_path`, plus `giant_files` generated-like files of about `giant_size` bytes with their
+    imports only at the top. Returns the paths written.
+    """
+    rng = Random(seed)
+    file_paths = []
+    for i in range(files):
+        parts = [f'pkg_{rng.randrange(8)}' for _ in range(rng.randrange(depth + 1))]
+        folder = join(folder_path, *parts)
+        makedirs(folder, exist_ok=True)
+        name = f'test_module_{i}.py' if rng.random() < test_ratio else f'module_{i}.py'
+        file_paths.append(join(folder, name))
+        with open(file_paths[-1], 'w', encoding='utf-8') as f:
+            f.write(_source(rng, imports, file_size))
+    for i in range(giant_files):
+        makedirs(join(folder_path, 'generated'), exist_ok=True)
+        file_paths.append(join(folder_path, 'generated', f'giant_{i}_pb2.py'))
+        header = '\n'.join(_import_line(rng) for _ in range(imports)) + '\n'
+        row = 'DESCRIPTOR_{0} = _descriptor.FieldDescriptor(name="field_{0}", index={0}, number={0}, type=9, default_value=b"")\n'
+        with open(file_paths[-1], 'w', encoding='utf-8') as f:
+            f.write(header)
+            written, j = len(header), 0
+            while written < giant_size:
+                line = row.format(j)
+                f.write(line)
+                written += len(line)
+                j += 1
+    return file_paths
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description="Generates a synthetic source tree to benchmark the scan on")
+    parser.add_argument("folder")
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--file-size", type=int, default=4000)
+    parser.add_argument("--imports", type=int, default=10)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--test-ratio", type=float, default=0.2)
+    parser.add_argument("--giant-files", type=int, default=0)
+    parser.add_argument("--giant-size", type=int, default=5_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(len(generate_tree(args.folder, args.files, args.file_size, args.imports, args.depth, args.test_ratio, args.giant_files, args.giant_size, args.seed)))
@@ -1 +1,8 @@
-from .run import get_requirements
\ No newline at end of file
+__all__ = ['get_requirements']
+
+def __getattr__(name:str):
+    "imports run (and so pydantic, cli_pprinter and file_handler) only when get_requirements is used, so the cli starts fast"
+    if name == 'get_requirements':
+        from .run import get_requirements
+        return get_requirements
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,91 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from json import dump, dumps
+from typing import Callable, TextIO
+from os.path import abspath, dirname, join, isabs
+from pydantic import BaseModel
+from cli_pprinter import CLIPPrinter
+from .cache import open_scan_cache
+from .get_standard_python_libraries import STDLIB_INDEX_DIR
+from .policy import Policy, PolicyError
+from .run import PackagesInfo, get_requirements
+from .report import package_records
+
+BATCH_CACHE_PATH = join(dirname(STDLIB_INDEX_DIR), 'scan_cache.json')
+
+class ProjectResult(BaseModel):
+    folder_path:str
+    result:PackagesInfo|None = None
+    error:str|None = None
+
+def load_manifest(manifest_path:str) -> list[str]:
+    "returns the project folders listed in `manifest_path`, one per line (blank lines and lines starting with # are skipped). Relative paths are relative to the manifest"
+    with open(manifest_path, encoding='utf-8') as f:
+        lines = [line.strip() for line in f.read().splitlines()]
+    base = dirname(abspath(manifest_path))
+    return [line if isabs(line) else join(base, line) for line in lines if line and not line.startswith('#')]
+
+def get_requirements_for_projects(folder_paths:list[str], project_jobs:int = 4, use_cache:bool = False, cache_path:str = None, cache_hash:bool = False, policy:Policy|dict|str = None, header_only:bool = False, python_version:str = None, on_result:Callable[[ProjectResult], None] = None, **kwargs) -> dict[str, ProjectResult]:
+    """
+    Runs `get_requirements` for many projects in a single process, `project_jobs` of them at a time (threads), never asking the user
+    (categories without a policy are kept as they are).
+
+    The standard modules index is built once and, if `use_cache`, a single scan cache (keyed by absolute file path) is shared by all
+    the projects and saved at the end (dropping only entries of these projects' files that were not scanned, or of files that don't
+    exist anymore, so runs over different projects can share it). A project whose policy fails doesn't stop the others: its error is kept in its ProjectResult.
+
+    Args:
+        folder_paths (list[str]): folders of the projects.
+        project_jobs (int, optional): number of projects processed at the same time. Defaults to 4.
+        use_cache (bool, optional): uses the shared scan cache. Defaults to False.
+        cache_path (str, optional): path of the shared scan cache. Defaults to None (~/.cache/get_requirements/scan_cache.json).
+        cache_hash (bool, optional): also compares the content hash of files whose mtime changed. Defaults to False.
+        policy (Policy|dict|str, optional): policy used for all projects, on top of the one in each project's pyproject.toml. Defaults to None.
+        header_only (bool, optional): see `get_requirements`. Defaults to False.
+        python_version (str, optional): see `get_requirements`. Defaults to None.
+        on_result (Callable[[ProjectResult], None], optional): called (in the calling thread) with the result of each project as soon as it's done, e.g. to stream them with `write_project_jsonl`. Defaults to None.
+        **kwargs: other arguments of `get_requirements` (e.g. write_requirements_file, jobs, excludes).
+
+    Returns:
+        dict[str, ProjectResult]: result of each project, in the order of `folder_paths`, keyed by its absolute folder path.
+    """
+    folder_paths = [abspath(f) for f in folder_paths]
+    cache = None
+    if use_cache:
+        cache = open_scan_cache(cache_path or BATCH_CACHE_PATH, header_only=header_only, python_version=python_version, use_hash=cache_hash)
+    def run_project(folder_path:str) -> ProjectResult:
+        try:
+            return ProjectResult(
+                folder_path=folder_path,
+                result=get_requirements(folder_path=folder_path, policy=policy, batch=True, header_only=header_only, python_version=python_version, cache=cache, **kwargs)
+            )
+        except (PolicyError, ValueError, OSError) as e:
+            return ProjectResult(folder_path=folder_path, error=str(e))
+    with ThreadPoolExecutor(max_workers=max(project_jobs, 1)) as pool:
+        futures = [pool.submit(run_project, f) for f in folder_paths]
+        if on_result is not None:
+            for future in as_completed(futures):
+                on_result(future.result())
+        results = {f:future.result() for f, future in zip(folder_paths, futures)}
+    if cache is not None:
+        cache.save(roots=folder_paths)
+        CLIPPrinter.white(f'Scan cache: {cache.hits} hits, {cache.misses} misses')
+        if kwargs.get('profiler') is not None:
+            kwargs['profiler'].counters.update({'cache_hits': cache.hits, 'cache_misses': cache.misses})
+    return results
+
+def write_projects_report(results:dict[str, ProjectResult], output_path:str = None) -> dict:
+    "writes the results of all projects as a single json keyed by project folder to `output_path` (if given) and returns it"
+    report = {k:v.model_dump(mode='json') for k,v in results.items()}
+    if output_path is not None:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            dump(report, f, indent=2)
+    return report
+
+def write_project_jsonl(project:ProjectResult, f:TextIO):
+    "writes a json line per package of `project` to `f` (or a single line with its error) and flushes it, so results can be streamed"
+    if project.result is None:
+        f.write(dumps({'folder_path': project.folder_path, 'error': project.error}) + '\n')
+    else:
+        for record in package_records(project.result, project.folder_path):
+            f.write(dumps(record) + '\n')
+    f.flush()
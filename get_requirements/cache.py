@@ -0,0 +1,121 @@
+from hashlib import sha1
+from json import dump, load
+from os import replace, stat, getpid, makedirs, sep
+from os.path import exists, dirname
+from threading import Lock
+from .get_standard_python_libraries import get_standard_python_libraries
+from .scanner import SCANNER_VERSION
+
+CACHE_FILE_NAME = '.get_requirements_cache'
+
+def make_fingerprint(*parts) -> str:
+    "returns a short hash identifying `parts` (e.g. scanner version and standard modules), used to invalidate a cache when any of them changes"
+    digest = sha1()
+    for part in parts:
+        if isinstance(part, (set, frozenset, list, tuple)):
+            part = '\n'.join(sorted(part))
+        digest.update(str(part).encode())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+def hash_file(file_path:str) -> str:
+    "returns the sha1 of the content of `file_path`"
+    digest = sha1()
+    with open(file_path, 'rb') as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ScanCache:
+    """
+    On disk cache of the modules imported by each py file.
+
+    An entry is reused if the file has the same mtime and size as when it was scanned. If `use_hash` is True, a file with a different
+    mtime but the same size and content hash (e.g. touched by a git checkout) is reused as well. The whole cache is dropped when
+    `fingerprint` changes, so it must identify everything the scan results depend on (scanner version, standard modules, ...).
+    Entries of files that were not looked up since the cache was loaded (deleted files) are dropped when saving (only the ones under
+    some folders, if given, see `save`).
+    The same cache can be used by many scans at once (e.g. of different projects in threads).
+    """
+    def __init__(self, cache_path:str, fingerprint:str = '', use_hash:bool = False):
+        self.cache_path = cache_path
+        self.fingerprint = fingerprint
+        self.use_hash = use_hash
+        self.hits = 0
+        self.misses = 0
+        self.entries:dict[str, list] = {}
+        self._seen:set[str] = set()
+        self._stats:dict[str, tuple[int, int]] = {}
+        self._lock = Lock()
+        self.load()
+
+    def load(self):
+        "loads the entries from `cache_path`, ignoring it if it's unreadable or was made with another fingerprint"
+        if not exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, encoding='utf-8') as f:
+                data = load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get('fingerprint') != self.fingerprint:
+            return
+        self.entries = data.get('files', {})
+
+    def get(self, file_path:str) -> list|None:
+        "returns the cached scan result of `file_path` or None if it's not cached or the file changed"
+        self._seen.add(file_path)
+        st = stat(file_path)
+        entry = self.entries.get(file_path)
+        if entry is not None:
+            mtime, size, content_hash, result = entry
+            if st.st_mtime_ns == mtime and st.st_size == size:
+                with self._lock:
+                    self.hits += 1
+                return result
+            if self.use_hash and content_hash and st.st_size == size and hash_file(file_path) == content_hash:
+                entry[0] = st.st_mtime_ns
+                with self._lock:
+                    self.hits += 1
+                return result
+        with self._lock:
+            self.misses += 1
+        self._stats[file_path] = (st.st_mtime_ns, st.st_size)
+        return None
+
+    def set(self, file_path:str, result:list):
+        "stores the scan result of `file_path`, keyed by the mtime and size it had when it was looked up (so changes made while scanning are not hidden)"
+        self._seen.add(file_path)
+        if file_path in self._stats:
+            mtime, size = self._stats.pop(file_path)
+        else:
+            st = stat(file_path)
+            mtime, size = st.st_mtime_ns, st.st_size
+        self.entries[file_path] = [mtime, size, hash_file(file_path) if self.use_hash else None, result]
+
+    def save(self, roots:list[str] = None):
+        """
+        writes the cache to `cache_path`, dropping entries of files that were not seen. With `roots` (e.g. of a cache shared by many
+        projects, where a run covers only some of them), only entries under `roots` are dropped if not seen, and the others only if
+        their file doesn't exist anymore
+        """
+        with self._lock:
+            if roots is None:
+                self.entries = {k:v for k,v in self.entries.items() if k in self._seen}
+            else:
+                prefixes = tuple(r.rstrip(sep) + sep for r in roots)
+                self.entries = {k:v for k,v in self.entries.items() if k in self._seen or (not k.startswith(prefixes) and exists(k))}
+            if dirname(self.cache_path):
+                makedirs(dirname(self.cache_path), exist_ok=True)
+            tmp_path = f'{self.cache_path}.{getpid()}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                dump({'fingerprint': self.fingerprint, 'files': self.entries}, f, separators=(',', ':'))
+            replace(tmp_path, self.cache_path)
+
+def open_scan_cache(cache_path:str, header_only:bool = False, python_version:str = None, use_hash:bool = False) -> ScanCache:
+    "returns the ScanCache at `cache_path`, with a fingerprint of everything the scan results depend on"
+    return ScanCache(
+        cache_path=cache_path,
+        fingerprint=make_fingerprint(SCANNER_VERSION, header_only, get_standard_python_libraries(python_version)),
+        use_hash=use_hash
+    )
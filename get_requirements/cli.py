@@ -0,0 +1,98 @@
+"""
+Entry point of the get_requirements console script. It only imports what the arguments need: --check runs without pydantic,
+cli_pprinter and file_handler (so it's fast enough for pre-commit hooks) and anything else is handed to `get_requirements.run.cli`.
+"""
+from argparse import ArgumentParser
+from os import getcwd
+from os.path import exists, join
+import sys
+
+CHECK_CATEGORIES = {
+    'missing': 'imported in py files that are not test files, but not in {requirements_file}',
+    'unused': 'in {requirements_file}, but not imported in py files that are not test files',
+    'standard': 'standard python module in {requirements_file}',
+    'dev_missing': 'imported in py files, but not in {requirements_file}',
+    'dev_unused': 'in {requirements_file}, but not imported in py files'
+}
+
+def _read_requirements(requirements_file_path:str) -> set[str]:
+    if not exists(requirements_file_path):
+        return set()
+    with open(requirements_file_path, encoding='utf-8') as f:
+        return set(f.read().splitlines())
+
+def check(folder_path:str = None, requirements_file_path:str = None, requirements_dev_file_path:str = None, jobs:int = 1, executor:str = 'thread', excludes:list[str] = None, use_default_excludes:bool = True, use_gitignore:bool = True, python_version:str = None, header_only:bool = False, resolve_distributions:bool = True) -> list[tuple[str, str, str]]:
+    """
+    Returns the drift between the py files of `folder_path` and its requirements files, as (package, category, requirements_file),
+    with the same categories `get_requirements` asks about (see `requirements_drift`), without reading or writing anything else.
+    Arguments are the same as `get_requirements`.
+    """
+    from .get_standard_python_libraries import get_standard_python_libraries
+    from .graph import ImportGraph
+    from .imports import get_top_level_modules
+    from .index import ModuleIndex, requirements_drift
+    from .scanner import scan_files
+    from .walker import walk_py_files
+    folder_path = folder_path or getcwd()
+    if not exists(folder_path):
+        raise ValueError(f"folder_path {folder_path} doesn't exist!")
+    requirements = _read_requirements(requirements_file_path or join(folder_path, 'requirements.txt'))
+    requirements_dev = _read_requirements(requirements_dev_file_path or join(folder_path, 'requirements_dev.txt'))
+    standard_modules = get_standard_python_libraries(python_version)
+    resolver = None
+    if resolve_distributions:
+        from .distributions import get_distribution_resolver
+        resolver = get_distribution_resolver()
+    index = ModuleIndex()
+    graph = ImportGraph(folder_path)
+    file_paths = list(walk_py_files(folder_path, excludes=excludes, use_default_excludes=use_default_excludes, use_gitignore=use_gitignore, graph=graph))
+    for file, records in scan_files(file_paths, jobs=jobs, executor=executor, header_only=header_only):
+        records = graph.add_file(file, records)
+        index.add_file(file, resolver.requirement_names(records, standard_modules) if resolver else get_top_level_modules(records))
+    return requirements_drift(index.imported(), requirements, requirements_dev, standard_modules)
+
+def add_scan_arguments(parser:ArgumentParser):
+    "adds the arguments of the folder, requirements files and scan, shared by `main` (--check) and `get_requirements.run.cli`"
+    from .scanner import EXECUTORS
+    parser.add_argument("-f", help="Path to the folder to search in. Default to current directory if not passed")
+    parser.add_argument("-rf", help="Relative path to the requirements.txt file. Default to folder_path/requirements.txt")
+    parser.add_argument("-rdf", help="Relative path to the requirements_dev.txt file. Default to folder_path/requirements_dev.txt")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Number of workers used to scan the py files. Default to 1. 0 uses one worker per cpu")
+    parser.add_argument("-ex", "--executor", choices=EXECUTORS, default='thread', help="How the workers run: serial, thread (I/O bound) or process (cpu bound). Default to thread")
+    parser.add_argument("-x", "--exclude", action='append', default=[], help="Glob pattern of files or folders to skip (name or path relative to the folder). Can be passed many times")
+    parser.add_argument("-nde", "--no-default-excludes", action='store_true', help="Don't skip __pycache__, venv, node_modules, build, dist and egg-info folders")
+    parser.add_argument("-ngi", "--no-gitignore", action='store_true', help="Don't skip files and folders ignored by .gitignore files")
+    parser.add_argument("-py", "--python-version", help="Python version (e.g. 3.12) used to tell which modules are standard. Default to the running python")
+    parser.add_argument("-ho", "--header-only", action='store_true', help="Only read each py file up to its first top level def/class (imports inside functions are not found)")
+    parser.add_argument("-nr", "--no-resolve", action='store_true', help="Use the imported module names as they are, instead of the names of the distributions that provide them (e.g. yaml instead of pyyaml)")
+
+def main():
+    "runs `check` with --check (exiting with 1 if the requirements files drifted), else `get_requirements.run.cli`"
+    if '--check' not in sys.argv[1:]:
+        from .run import cli
+        return cli()
+    parser = ArgumentParser(description="Checks that requirements.txt and requirements_dev.txt match the imports of the py files, without changing them. Exits with 1 if they don't")
+    parser.add_argument("--check", action='store_true', help="Only check that the requirements files match the imports")
+    add_scan_arguments(parser)
+    parser.add_argument("-q", "--quiet", action='store_true', help="Don't print the drift, only exit with 1")
+    args, _ = parser.parse_known_args()
+    drift = check(
+        folder_path=args.f,
+        requirements_file_path=args.rf,
+        requirements_dev_file_path=args.rdf,
+        jobs=args.jobs,
+        executor=args.executor,
+        excludes=args.exclude,
+        use_default_excludes=not args.no_default_excludes,
+        use_gitignore=not args.no_gitignore,
+        python_version=args.python_version,
+        header_only=args.header_only,
+        resolve_distributions=not args.no_resolve
+    )
+    if not args.quiet:
+        for package, category, requirements_file in drift:
+            print(f'package {package}: {CHECK_CATEGORIES[category].format(requirements_file=requirements_file)}')
+    raise SystemExit(1 if drift else 0)
+
+if __name__ == '__main__':
+    main()
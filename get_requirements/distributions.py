@@ -0,0 +1,177 @@
+from functools import cache
+from importlib.metadata import packages_distributions, distribution, PackageNotFoundError
+from json import dump, load
+from os import stat, replace, getpid, makedirs
+from os.path import join, dirname, exists, isdir
+from re import sub
+from sys import path as sys_path
+from .cache import make_fingerprint
+from .imports import ImportRecord
+from .get_standard_python_libraries import STDLIB_INDEX_DIR
+
+DISTRIBUTIONS_INDEX_PATH = join(dirname(STDLIB_INDEX_DIR), 'distributions.json')
+KNOWN_DISTRIBUTIONS = {
+    'attr': 'attrs',
+    'azure.identity': 'azure-identity',
+    'azure.storage.blob': 'azure-storage-blob',
+    'bs4': 'beautifulsoup4',
+    'cairo': 'pycairo',
+    'crypto': 'pycryptodome',
+    'cv2': 'opencv-python',
+    'dateutil': 'python-dateutil',
+    'docx': 'python-docx',
+    'dotenv': 'python-dotenv',
+    'faiss': 'faiss-cpu',
+    'fitz': 'pymupdf',
+    'gi': 'pygobject',
+    'git': 'gitpython',
+    'google.api_core': 'google-api-core',
+    'google.auth': 'google-auth',
+    'google.cloud.bigquery': 'google-cloud-bigquery',
+    'google.cloud.pubsub': 'google-cloud-pubsub',
+    'google.cloud.storage': 'google-cloud-storage',
+    'google.protobuf': 'protobuf',
+    'googleapiclient': 'google-api-python-client',
+    'jose': 'python-jose',
+    'jwt': 'pyjwt',
+    'kafka': 'kafka-python',
+    'ldap': 'python-ldap',
+    'magic': 'python-magic',
+    'multipart': 'python-multipart',
+    'mysqldb': 'mysqlclient',
+    'nacl': 'pynacl',
+    'opengl': 'pyopengl',
+    'openssl': 'pyopenssl',
+    'pil': 'pillow',
+    'pkg_resources': 'setuptools',
+    'pptx': 'python-pptx',
+    'serial': 'pyserial',
+    'skimage': 'scikit-image',
+    'sklearn': 'scikit-learn',
+    'slugify': 'python-slugify',
+    'telegram': 'python-telegram-bot',
+    'umap': 'umap-learn',
+    'usb': 'pyusb',
+    'websocket': 'websocket-client',
+    'win32api': 'pywin32',
+    'win32con': 'pywin32',
+    'wx': 'wxpython',
+    'yaml': 'pyyaml',
+    'zmq': 'pyzmq',
+}
+
+def normalize_name(name:str) -> str:
+    "normalizes a distribution (or import) name as in PEP 503, so 'Foo_Bar' and 'foo-bar' are the same"
+    return sub(r'[-_.]+', '-', name).lower()
+
+def _module_prefixes(file_parts:tuple[str, ...], top:str, max_depth:int = 3) -> list[str]:
+    "returns the dotted module prefixes (from 2 levels deep) of a file installed by a distribution under the package `top`"
+    if len(file_parts) < 2 or file_parts[0].lower() != top:
+        return []
+    parts = [p.lower() for p in file_parts[:max_depth]]
+    if parts[-1].endswith('.py'):
+        parts[-1] = parts[-1][:-3]
+    parts = [p for p in parts if p != '__init__' and p != '__pycache__' and not p.endswith('.pyc')]
+    return ['.'.join(parts[:i]) for i in range(2, len(parts) + 1)]
+
+def build_distribution_index() -> dict[str, str]:
+    """
+    Returns a lowercased module name -> distribution name index of the installed distributions, built from their metadata (top_level.txt
+    and RECORD files, through `importlib.metadata.packages_distributions`). For packages shared by many distributions (namespace
+    packages, like google), their subpackages (e.g. google.protobuf) are indexed instead, from the files each distribution installed.
+    """
+    index = {}
+    for top, dists in packages_distributions().items():
+        top = top.lower()
+        dists = list(dict.fromkeys(dists))
+        if len(dists) == 1:
+            index[top] = dists[0]
+            continue
+        prefixes = {}
+        for dist in dists:
+            try:
+                files = distribution(dist).files or []
+            except PackageNotFoundError:
+                continue
+            for f in files:
+                for prefix in _module_prefixes(f.parts, top):
+                    prefixes.setdefault(prefix, set()).add(dist)
+        index.update({prefix:owners.pop() for prefix, owners in prefixes.items() if len(owners) == 1})
+    return index
+
+def _environment_fingerprint() -> str:
+    "changes whenever a distribution is installed or removed in one of the folders of sys.path"
+    return make_fingerprint(*[f'{p}:{stat(p).st_mtime_ns}' for p in sys_path if p and isdir(p)])
+
+class DistributionResolver:
+    "resolves import names to the names of the distributions that provide them, with a dict lookup (memoized per module)"
+    def __init__(self, index:dict[str, str]):
+        self.index = {**KNOWN_DISTRIBUTIONS, **index}
+        self._resolved:dict[str, str|None] = {}
+
+    def resolve(self, module:str) -> str|None:
+        """
+        returns the (lowercased) distribution name of the lowercased dotted `module`, using its longest indexed prefix, or None if it's
+        unknown or has the same (normalized) name as the top level module, which is then the requirement name itself
+        """
+        if module in self._resolved:
+            return self._resolved[module]
+        parts = module.split('.')
+        resolved = None
+        for i in range(len(parts), 0, -1):
+            dist = self.index.get('.'.join(parts[:i]))
+            if dist is not None:
+                if normalize_name(dist) != normalize_name(parts[0]):
+                    resolved = dist.lower()
+                break
+        self._resolved[module] = resolved
+        return resolved
+
+    def requirement_names(self, records:list[ImportRecord], standard_modules:frozenset = frozenset()) -> list[str]:
+        """
+        returns the requirement name of each absolute import in `records`, in order: the distribution that provides it or, if unknown or
+        standard, its lowercased top level module (as `get_top_level_modules`). `from google import protobuf` is resolved as google.protobuf
+        """
+        names = []
+        for r in records:
+            if r.level or not r.module:
+                continue
+            module = r.module.lower()
+            top = module.split('.')[0]
+            resolved = None
+            if top not in standard_modules:
+                for name in r.names:
+                    resolved = self.resolve(f'{module}.{name.lower()}')
+                    if resolved is not None:
+                        break
+                else:
+                    resolved = self.resolve(module)
+            names.append(resolved or top)
+        return names
+
+@cache
+def get_distribution_resolver(index_path:str = None) -> DistributionResolver:
+    """
+    Returns the resolver of the running environment. The index of the installed distributions is built once and kept on disk at
+    `index_path` (default ~/.cache/get_requirements/distributions.json) until a distribution is installed or removed.
+    """
+    index_path = index_path or DISTRIBUTIONS_INDEX_PATH
+    fingerprint = _environment_fingerprint()
+    if exists(index_path):
+        try:
+            with open(index_path, encoding='utf-8') as f:
+                data = load(f)
+            if data.get('fingerprint') == fingerprint:
+                return DistributionResolver(data['index'])
+        except (OSError, ValueError, KeyError):
+            pass
+    index = build_distribution_index()
+    try:
+        makedirs(dirname(index_path), exist_ok=True)
+        tmp_path = f'{index_path}.{getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            dump({'fingerprint': fingerprint, 'index': index}, f)
+        replace(tmp_path, index_path)
+    except OSError:
+        pass
+    return DistributionResolver(index)
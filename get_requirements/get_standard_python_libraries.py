@@ -1,9 +1,49 @@
-from sys import executable
-from os.path import dirname, join, splitext, exists, isdir, isfile
-from os import listdir
-
-def get_standard_python_libraries():
-    standard_lib_dir = join(dirname(executable), 'lib')
-    standard_libraries = [splitext(f)[0] for f in listdir(standard_lib_dir) if f.endswith('.py') and f != '__init__.py' and isfile(join(standard_lib_dir, f))]
-    standard_libraries += [f for f in listdir(standard_lib_dir) if isdir(join(standard_lib_dir, f)) and exists(join(standard_lib_dir, f, '__init__.py')) and not f.startswith('_')]
-    return standard_libraries + ['sys']
\ No newline at end of file
+from functools import cache
+from json import dump, load
+from os import makedirs, replace, getpid
+from os.path import join, exists, expanduser
+from sys import stdlib_module_names, builtin_module_names, version_info
+
+STDLIB_INDEX_DIR = join(expanduser('~'), '.cache', 'get_requirements', 'stdlib')
+
+def _current_python_version() -> str:
+    return f'{version_info.major}.{version_info.minor}'
+
+def _index_path(python_version:str, index_dir:str = None) -> str:
+    return join(index_dir or STDLIB_INDEX_DIR, f'stdlib_{python_version}.json')
+
+@cache
+def get_standard_python_libraries(python_version:str = None, index_dir:str = None) -> frozenset[str]:
+    """
+    Returns the (lowercased) names of the standard python modules, built from `sys.stdlib_module_names` and `sys.builtin_module_names`.
+    The result is memoized, so it's only built once per interpreter (and per python_version).
+
+    Args:
+        python_version (str, optional): python version (e.g. '3.12') to get the standard modules of. Defaults to None (the running python).
+            For other versions, the index must have been saved with `save_standard_python_libraries` by that python version, e.g. with
+            `python3.13 -m get_requirements.get_standard_python_libraries`.
+        index_dir (str, optional): folder with the saved indexes. Defaults to None (~/.cache/get_requirements/stdlib).
+    """
+    if python_version is None or python_version == _current_python_version():
+        return frozenset(m.lower() for m in stdlib_module_names | set(builtin_module_names))
+    index_path = _index_path(python_version, index_dir)
+    if not exists(index_path):
+        raise ValueError(
+            f"There is no standard modules index for python {python_version} in {index_path}! "
+            f"Create it running `python{python_version} -m get_requirements.get_standard_python_libraries`"
+        )
+    with open(index_path, encoding='utf-8') as f:
+        return frozenset(load(f))
+
+def save_standard_python_libraries(index_dir:str = None) -> str:
+    "saves the standard modules of the running python to `index_dir`, so other python versions can use them. Returns the index path"
+    index_path = _index_path(_current_python_version(), index_dir)
+    makedirs(index_dir or STDLIB_INDEX_DIR, exist_ok=True)
+    tmp_path = f'{index_path}.{getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        dump(sorted(get_standard_python_libraries()), f)
+    replace(tmp_path, index_path)
+    return index_path
+
+if __name__ == '__main__':
+    print(save_standard_python_libraries())
@@ -0,0 +1,169 @@
+from collections import Counter
+from os.path import basename, dirname, join, normpath
+from sys import intern
+from typing import Iterator
+from .imports import ImportRecord, get_top_level_modules
+
+class ImportGraph:
+    """
+    The modules and packages defined under `folder_path` (filled by `walk_py_files`, see `add_module`) and the imports between its py
+    files (filled while scanning, see `add_file`), so local imports are not taken as packages to install and the files pulling in a
+    package can be found without scanning again (see `files_pulling_in`).
+
+    An absolute import is local if its top level module is a py file or a folder with py files in the folder of the importing file
+    or in one of the folders above it (up to `folder_path`) that are not packages (without __init__.py, so for a file of a package
+    the search starts at the folder of the package), or in `folder_path`/src, as it would be when running or testing the file. A
+    module is never local to itself (e.g. `from celery import Celery` in proj/celery.py imports the celery package).
+
+    Paths are normalized (see `os.path.normpath`), so e.g. a trailing slash in `folder_path` doesn't matter, and the files returned
+    are normalized too.
+    """
+    __slots__ = ('folder_path', 'modules', 'packages', 'imports', 'imported_by', 'external', 'importers')
+
+    def __init__(self, folder_path:str):
+        self.folder_path = normpath(folder_path)
+        self.modules:dict[str, set[str]] = {}
+        self.packages = Counter()
+        self.imports:dict[str, tuple[str, ...]] = {}
+        self.imported_by:dict[str, set[str]] = {}
+        self.external:dict[str, tuple[str, ...]] = {}
+        self.importers:dict[str, set[str]] = {}
+
+    def _folders(self, file_path:str) -> Iterator[str]:
+        "yields the folders of `file_path` below folder_path, innermost first"
+        folder = dirname(file_path)
+        while folder != self.folder_path and len(folder) > len(self.folder_path):
+            yield folder
+            folder = dirname(folder)
+
+    def add_module(self, file_path:str) -> bool:
+        "adds the py file `file_path` (and its folders, as packages) to the local modules. Returns False if it was already there"
+        file_path = normpath(file_path)
+        name = basename(file_path)[:-3]
+        names = self.modules.setdefault(dirname(file_path), set())
+        if name in names:
+            return False
+        names.add(intern(name))
+        self.packages.update(self._folders(file_path))
+        return True
+
+    def remove_module(self, file_path:str) -> bool:
+        "removes the py file `file_path` from the local modules (and its folders, if no other py file is in them)"
+        file_path = normpath(file_path)
+        names = self.modules.get(dirname(file_path), set())
+        if basename(file_path)[:-3] not in names:
+            return False
+        names.discard(basename(file_path)[:-3])
+        if not names:
+            del self.modules[dirname(file_path)]
+        for folder in self._folders(file_path):
+            self.packages[folder] -= 1
+            if not self.packages[folder]:
+                del self.packages[folder]
+        return True
+
+    def _search_folders(self, file_path:str) -> Iterator[str]:
+        "yields the folders where the absolute imports of `file_path` are looked for, innermost first"
+        for folder in (*self._folders(file_path), self.folder_path):
+            if '__init__' not in self.modules.get(folder, ()):
+                yield folder
+        yield join(self.folder_path, 'src')
+
+    def _module_folder(self, file_path:str, name:str) -> str|None:
+        "returns the folder where the top level module `name`, imported in `file_path`, is defined (None if it's not local)"
+        for folder in self._search_folders(file_path):
+            if join(folder, name) in self.packages or (name in self.modules.get(folder, ()) and join(folder, name + '.py') != file_path):
+                return folder
+        return None
+
+    def is_local(self, file_path:str, module:str) -> bool:
+        "returns True if the top level module of `module`, imported in `file_path`, is defined under folder_path"
+        return self._module_folder(normpath(file_path), module.split('.')[0]) is not None
+
+    def _targets(self, file_path:str, record:ImportRecord) -> list[str]|None:
+        "returns the local py files `record` imports (empty if they can't be told) or None if it's not a local import"
+        parts = record.module.split('.') if record.module else []
+        if record.level:
+            folder = dirname(file_path)
+            for _ in range(record.level - 1):
+                folder = dirname(folder)
+        elif not parts:
+            return None
+        else:
+            folder = self._module_folder(file_path, parts[0])
+            if folder is None:
+                return None
+        targets = []
+        for part in parts:
+            if join(folder, part) not in self.packages:
+                if part in self.modules.get(folder, ()):
+                    targets.append(join(folder, part + '.py'))
+                return targets
+            folder = join(folder, part)
+            if '__init__' in self.modules.get(folder, ()):
+                targets.append(join(folder, '__init__.py'))
+        for name in record.names:
+            if name in self.modules.get(folder, ()):
+                targets.append(join(folder, name + '.py'))
+            elif '__init__' in self.modules.get(join(folder, name), ()):
+                targets.append(join(folder, name, '__init__.py'))
+        if not parts and '__init__' in self.modules.get(folder, ()):
+            targets.append(join(folder, '__init__.py'))
+        return targets
+
+    def add_file(self, file_path:str, records:list[ImportRecord]) -> list[ImportRecord]:
+        "replaces the imports of `file_path` with `records` and returns the ones that are not local (the ones to find packages in)"
+        file_path = intern(normpath(file_path))
+        if file_path in self.imports:
+            self.remove_file(file_path)
+        targets, external = {}, []
+        for record in records:
+            record_targets = self._targets(file_path, record)
+            if record_targets is None:
+                external.append(record)
+            else:
+                targets.update(dict.fromkeys(record_targets))
+        targets.pop(file_path, None)
+        self.imports[file_path] = tuple(intern(t) for t in targets)
+        for target in self.imports[file_path]:
+            self.imported_by.setdefault(target, set()).add(file_path)
+        self.external[file_path] = tuple(dict.fromkeys(get_top_level_modules(external)))
+        for module in self.external[file_path]:
+            self.importers.setdefault(module, set()).add(file_path)
+        return external
+
+    def remove_file(self, file_path:str):
+        "removes the imports of `file_path`"
+        file_path = normpath(file_path)
+        for target in self.imports.pop(file_path, ()):
+            self.imported_by[target].discard(file_path)
+            if not self.imported_by[target]:
+                del self.imported_by[target]
+        for module in self.external.pop(file_path, ()):
+            self.importers[module].discard(file_path)
+            if not self.importers[module]:
+                del self.importers[module]
+
+    def affected_by(self, file_path:str) -> set[str]:
+        "returns the files whose imports may resolve differently once the py file `file_path` is added to or removed from the local modules"
+        file_path = normpath(file_path)
+        names = [basename(file_path)[:-3].lower()] + [basename(f).lower() for f in self._folders(file_path)]
+        affected = set(self.imported_by.get(file_path, ()))
+        for name in names:
+            affected.update(self.importers.get(name, ()))
+        affected.discard(file_path)
+        return affected
+
+    def files_pulling_in(self, module:str) -> list[str]:
+        """
+        returns the files importing the top level module `module` (as imported, e.g. 'yaml', not 'pyyaml') and the files importing
+        them through local modules, directly or not, sorted
+        """
+        seen = set(self.importers.get(module.split('.')[0].lower(), ()))
+        stack = list(seen)
+        while stack:
+            for file_path in self.imported_by.get(stack.pop(), ()):
+                if file_path not in seen:
+                    seen.add(file_path)
+                    stack.append(file_path)
+        return sorted(seen)
@@ -0,0 +1,245 @@
+from bisect import bisect_right
+from ast import parse, Import, ImportFrom, If, Try, TryStar, Name, Attribute, FunctionDef, AsyncFunctionDef
+from re import MULTILINE, compile
+from typing import NamedTuple
+
+BOM = b'\xef\xbb\xbf'
+IMPORT_KEYWORD_PATTERN = compile(rb'import')
+CANDIDATE_PATTERN = compile(rb'([ \t]*)(?:import|from)(?=[ \t\\(.])')
+IMPORT_STATEMENT_PATTERN = compile(rb'[;:][ \t]*(?:import|from)(?=[ \t\\(.])')
+TRIPLE_QUOTE_PATTERN = compile(rb'"""|\'\'\'')
+BLOCK_TRY_PATTERN = compile(rb'(?:try|except)\b')
+BLOCK_TYPE_CHECKING_PATTERN = compile(rb'(?:el)?if[ \t]+(?:\w+\.)?TYPE_CHECKING[ \t]*:')
+STRING_PATTERN = compile(rb'#[^\n]*|("""|\'\'\')(?:[^\\]|\\[\s\S])*?\1|"(?:[^"\\\n]|\\[\s\S])*"|\'(?:[^\'\\\n]|\\[\s\S])*\'')
+FALLBACK_PATTERN = compile(rb'^[ \t]*(?:from[ \t]+(\.*)[ \t]*([\w.]*)[ \t]+import[ \t]+\(?([\w., \t*]+)|import[ \t]+([\w., \t]+))', MULTILINE)
+
+class ImportRecord(NamedTuple):
+    """
+    An import statement found in a py file. `from a.b import c, d` is a single record, `import a, b` is one record per module.
+    `in_type_checking` and `in_try` only consider the blocks inside the function (or module) where the import is.
+    """
+    module:str
+    level:int = 0
+    line:int = 0
+    in_type_checking:bool = False
+    in_try:bool = False
+    names:tuple[str, ...] = ()
+
+def records_from_json(rows:list[list]) -> list[ImportRecord]:
+    "rebuilds the ImportRecords serialized as json lists (e.g. by ScanCache)"
+    return [ImportRecord(module, level, line, in_type_checking, in_try, tuple(names)) for module, level, line, in_type_checking, in_try, names in rows]
+
+def _is_type_checking(test) -> bool:
+    return (isinstance(test, Name) and test.id == 'TYPE_CHECKING') or (isinstance(test, Attribute) and test.attr == 'TYPE_CHECKING')
+
+def _visit(nodes:list, in_type_checking:bool, in_try:bool, records:list[ImportRecord]):
+    for node in nodes:
+        if isinstance(node, Import):
+            records.extend(ImportRecord(alias.name, 0, node.lineno, in_type_checking, in_try) for alias in node.names)
+        elif isinstance(node, ImportFrom):
+            records.append(ImportRecord(node.module or '', node.level, node.lineno, in_type_checking, in_try, tuple(alias.name for alias in node.names)))
+        elif isinstance(node, (FunctionDef, AsyncFunctionDef)):
+            _visit(node.body, False, False, records)
+        elif isinstance(node, If):
+            _visit(node.body, in_type_checking or _is_type_checking(node.test), in_try, records)
+            _visit(node.orelse, in_type_checking, in_try, records)
+        elif isinstance(node, (Try, TryStar)):
+            _visit(node.body, in_type_checking, True, records)
+            for handler in node.handlers:
+                _visit(handler.body, in_type_checking, True, records)
+            _visit(node.orelse, in_type_checking, in_try, records)
+            _visit(node.finalbody, in_type_checking, in_try, records)
+        else:
+            for field in ('body', 'orelse', 'finalbody', 'handlers', 'cases'):
+                children = getattr(node, field, None)
+                if children:
+                    _visit(children, in_type_checking, in_try, records)
+
+def _extract_imports_fallback(source:bytes) -> list[ImportRecord]:
+    records = []
+    for match in FALLBACK_PATTERN.finditer(source):
+        line = source.count(b'\n', 0, match.start()) + 1
+        dots, from_module, names, modules = match.groups()
+        if modules is None:
+            names = tuple(n.split()[0].decode() for n in names.split(b',') if n.strip())
+            records.append(ImportRecord(from_module.decode(), len(dots), line, names=names))
+        else:
+            records.extend(ImportRecord(m.split()[0].decode(), 0, line) for m in modules.split(b',') if m.strip())
+    return records
+
+def _extract_imports_ast(source:bytes) -> list[ImportRecord]:
+    try:
+        tree = parse(source)
+    except (SyntaxError, ValueError):
+        return _extract_imports_fallback(source)
+    records = []
+    _visit(tree.body, False, False, records)
+    return records
+
+def _statement_end(source:bytes, pos:int) -> int:
+    "returns the end of the logical line starting before `pos`, following parentheses and backslash continuations"
+    end = source.find(b'\n', pos)
+    if end == -1:
+        return len(source)
+    line = source[pos:end].split(b'#')[0]
+    if line.count(b'(') > line.count(b')'):
+        closing = source.find(b')', end)
+        return _statement_end(source, closing) if closing != -1 else len(source)
+    if line.rstrip().endswith(b'\\'):
+        return _statement_end(source, end + 1)
+    return end
+
+def _context(source:bytes, line_start:int, indent:int) -> tuple[bool, bool]:
+    "returns (in_type_checking, in_try) of a line by going back through the headers of the blocks containing it, up to the enclosing def"
+    in_type_checking = in_try = False
+    end = line_start
+    while indent and end > 0:
+        start = source.rfind(b'\n', 0, end - 1) + 1
+        line = source[start:end - 1]
+        end = start
+        stripped = line.lstrip(b' \t')
+        if not stripped or stripped.startswith(b'#') or len(line) - len(stripped) >= indent:
+            continue
+        indent = len(line) - len(stripped)
+        if BLOCK_TRY_PATTERN.match(stripped):
+            in_try = True
+        elif BLOCK_TYPE_CHECKING_PATTERN.match(stripped):
+            in_type_checking = True
+        elif stripped.startswith((b'def ', b'async def ')):
+            break
+    return in_type_checking, in_try
+
+def _multiline_string_spans(source:bytes, pos:int=0, stop:int|None=None) -> tuple[list[int], list[int]]:
+    """
+    returns the starts and ends of the triple quoted strings of `source` from `pos` (up to the ones starting at `stop`), skipping quotes
+    inside comments and single line strings
+    """
+    starts = []
+    ends = []
+    for match in STRING_PATTERN.finditer(source, pos):
+        if stop is not None and match.start() > stop:
+            break
+        if match.group(1):
+            starts.append(match.start())
+            ends.append(match.end())
+    return starts, ends
+
+def _triple_quoted_spans(source:bytes, stop:int) -> tuple[list[int], list[int]]:
+    """
+    returns the starts and ends of the triple quoted strings of `source` up to the ones starting at `stop`, jumping from each opening
+    triple quote to its closing one, which is much faster than `_multiline_string_spans`. That is used from the line of an opening
+    triple quote on if it comes after a comment or another quote in the line (so it may be inside a comment or a single line string)
+    or if its closing one is missing or escaped
+    """
+    starts = []
+    ends = []
+    double_quotes, single_quotes = source.find(b'"""'), source.find(b"'''")
+    while double_quotes != -1 or single_quotes != -1:
+        start = double_quotes if single_quotes == -1 or -1 < double_quotes < single_quotes else single_quotes
+        if start > stop:
+            break
+        line_start = source.rfind(b'\n', 0, start) + 1
+        prefix = source[line_start:start]
+        end = source.find(source[start:start + 3], start + 3)
+        if b'#' in prefix or b'"' in prefix or b"'" in prefix or end == -1 or source[end - 1] == 92:
+            rest = _multiline_string_spans(source, max(line_start, ends[-1] if ends else 0), stop)
+            return starts + rest[0], ends + rest[1]
+        starts.append(start)
+        ends.append(end + 3)
+        if -1 < double_quotes < end + 3:
+            double_quotes = source.find(b'"""', end + 3)
+        if -1 < single_quotes < end + 3:
+            single_quotes = source.find(b"'''", end + 3)
+    return starts, ends
+
+def _logical_line_start(source:bytes, line_start:int) -> int:
+    "returns the start of the logical line containing the line starting at `line_start`, going back through backslash continuations"
+    while line_start > 1 and (source[line_start - 2] == 92 or (source[line_start - 2] == 13 and line_start > 2 and source[line_start - 3] == 92)):
+        line_start = source.rfind(b'\n', 0, line_start - 1) + 1
+    return line_start
+
+def _candidates(source:bytes):
+    """
+    yields the start of each logical line containing `import` and the match of CANDIDATE_PATTERN there (None if the line doesn't
+    start with `import`/`from`), which is much faster than a multiline regex
+    """
+    last_line_start = -1
+    for keyword in IMPORT_KEYWORD_PATTERN.finditer(source):
+        line_start = _logical_line_start(source, source.rfind(b'\n', 0, keyword.start()) + 1)
+        if line_start == last_line_start:
+            continue
+        last_line_start = line_start
+        yield line_start, CANDIDATE_PATTERN.match(source, line_start)
+
+def _has_import_statement(source:bytes, line_start:int) -> bool:
+    """
+    returns True if the line starting at `line_start` has an import after a `;` or a block `:` (e.g. `x = 1; import os` or
+    `try: import ujson`), outside its strings and comments. What follows a triple quote left open on the line is a string too
+    """
+    line_end = source.find(b'\n', line_start)
+    line = STRING_PATTERN.sub(b'', source[line_start:None if line_end == -1 else line_end])
+    match = TRIPLE_QUOTE_PATTERN.search(line)
+    return IMPORT_STATEMENT_PATTERN.search(line, 0, len(line) if match is None else match.start()) is not None
+
+def extract_imports(source:bytes) -> list[ImportRecord]:
+    """
+    Returns the imports of the python `source` (bytes, so the encoding declared in the file is respected), in the order they appear.
+
+    Parsing whole files with `ast` is slow, so a byte level pre-filter finds the lines with `import` that start with `import`/`from` first
+    (files without the `import` keyword return right away), drops the ones inside multi line strings (see `_triple_quoted_spans`)
+    and only those statements are parsed with `ast`. If they don't parse alone, or if a line has an import after another statement
+    (e.g. `x = 1; import os` or `try: import ujson`), the whole file is parsed instead, and if the file is not valid python a line
+    based regex is used, so imports of broken files are still found.
+    """
+    if b'import' not in source:
+        return []
+    if source.startswith(BOM):
+        source = source[len(BOM):]
+    candidates = list(_candidates(source))
+    if not candidates:
+        return []
+    spans = _triple_quoted_spans(source, candidates[-1][0])
+    statements = []
+    contexts = []
+    lines = []
+    last = 0
+    line = 1
+    for start, candidate in candidates:
+        line += source.count(b'\n', last, start)
+        last = start
+        i = bisect_right(spans[0], start) - 1
+        if i >= 0 and start < spans[1][i]:
+            continue
+        if candidate is None:
+            if _has_import_statement(source, start):
+                return _extract_imports_ast(source)
+            continue
+        indent = len(candidate.group(1))
+        statements.append(source[start + indent:_statement_end(source, candidate.end())])
+        contexts.append(_context(source, start, indent) if indent else (False, False))
+        lines.append(line)
+    if not statements:
+        return []
+    try:
+        tree = parse(b'\n'.join(statements))
+    except (SyntaxError, ValueError):
+        return _extract_imports_ast(source)
+    starts = []
+    current = 1
+    for statement in statements:
+        starts.append(current)
+        current += statement.count(b'\n') + 1
+    records = []
+    for node in tree.body:
+        i = bisect_right(starts, node.lineno) - 1
+        line = lines[i] + node.lineno - starts[i]
+        in_type_checking, in_try = contexts[i]
+        if isinstance(node, Import):
+            records.extend(ImportRecord(alias.name, 0, line, in_type_checking, in_try) for alias in node.names)
+        elif isinstance(node, ImportFrom):
+            records.append(ImportRecord(node.module or '', node.level, line, in_type_checking, in_try, tuple(alias.name for alias in node.names)))
+    return records
+
+def get_top_level_modules(records:list[ImportRecord]) -> list[str]:
+    "returns the lowercased top level module of each absolute import in `records`, in order (relative imports are local, so they are skipped)"
+    return [r.module.split('.')[0].lower() for r in records if r.level == 0 and r.module]
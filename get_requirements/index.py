@@ -0,0 +1,99 @@
+from array import array
+from os.path import basename
+from sys import intern
+from typing import Iterable, Iterator
+
+def is_test_file(file_path:str) -> bool:
+    "returns True if `file_path` is a test file (name ending with _test.py, starting with test_ or conftest.py)"
+    name = basename(file_path)
+    return name.endswith('_test.py') or name.startswith('test_') or name == 'conftest.py'
+
+class ModuleIndex:
+    """
+    Compact index of the modules imported in py files, filled while scanning: each file path is kept once (interned) and gets an id,
+    its test file flag is computed once, and each module maps to the set of ids of the files importing it. So memory and time grow
+    with the number of distinct modules and files, not with the number of import statements.
+
+    A file added again (e.g. saved, in watch mode) keeps its id and the ids of removed files are reused by the next files added, so
+    a long running index only grows with the number of files that exist at the same time.
+    """
+    __slots__ = ('files', 'file_ids', 'is_test', 'modules', 'file_modules', 'free_ids')
+
+    def __init__(self):
+        self.files:list[str|None] = []
+        self.file_ids:dict[str, int] = {}
+        self.is_test = array('b')
+        self.modules:dict[str, set[int]] = {}
+        self.file_modules:dict[int, tuple[str, ...]] = {}
+        self.free_ids:list[int] = []
+
+    def __len__(self) -> int:
+        return len(self.file_ids)
+
+    def __contains__(self, file_path:str) -> bool:
+        return file_path in self.file_ids
+
+    def add_file(self, file_path:str, modules:Iterable[str]) -> int:
+        "adds (or replaces) the modules imported in `file_path` and returns its id"
+        file_id = self.file_ids.get(file_path)
+        if file_id is not None:
+            self._remove_modules(file_id)
+        else:
+            file_path = intern(file_path)
+            if self.free_ids:
+                file_id = self.free_ids.pop()
+                self.files[file_id] = file_path
+                self.is_test[file_id] = is_test_file(file_path)
+            else:
+                file_id = len(self.files)
+                self.files.append(file_path)
+                self.is_test.append(is_test_file(file_path))
+            self.file_ids[file_path] = file_id
+        distinct = tuple(dict.fromkeys(modules))
+        self.file_modules[file_id] = distinct
+        for module in distinct:
+            self.modules.setdefault(module, set()).add(file_id)
+        return file_id
+
+    def remove_file(self, file_path:str):
+        "removes `file_path`, and the modules only it imported"
+        file_id = self.file_ids.pop(file_path)
+        self.files[file_id] = None
+        self.free_ids.append(file_id)
+        self._remove_modules(file_id)
+
+    def _remove_modules(self, file_id:int):
+        for module in self.file_modules.pop(file_id):
+            file_ids = self.modules[module]
+            file_ids.discard(file_id)
+            if not file_ids:
+                del self.modules[module]
+
+    def module_files(self, module:str) -> list[str]:
+        "returns the files importing `module`, by id (the order they were added, unless ids of removed files were reused)"
+        return [self.files[i] for i in sorted(self.modules.get(module, ()))]
+
+    def is_on_standard_files(self, module:str) -> bool:
+        "returns True if `module` is imported in a file that is not a test file"
+        return any(not self.is_test[i] for i in self.modules.get(module, ()))
+
+    def imported(self) -> dict[str, bool]:
+        "returns each module mapped to True if it's imported in a file that is not a test file (see `requirements_drift`)"
+        return {module:self.is_on_standard_files(module) for module in self.modules}
+
+    def iter_files(self) -> Iterator[str]:
+        "yields the files in the index, by id"
+        return (f for f in self.files if f is not None)
+
+def requirements_drift(imported:dict[str, bool], requirements:set[str], requirements_dev:set[str], standard_modules:frozenset) -> list[tuple[str, str, str]]:
+    """
+    returns (package, category, requirements_file) for each package to be added to or removed from requirements.txt ('unused',
+    'standard', 'missing') and requirements_dev.txt ('dev_unused', 'standard', 'dev_missing'), in that order and sorted by package.
+    `imported` maps each imported package to True if it's imported in a file that is not a test file (see `ModuleIndex.imported`)
+    """
+    packages = sorted(imported.keys() | requirements | requirements_dev)
+    drift = [(p, 'standard' if p in standard_modules else 'unused', 'requirements.txt') for p in packages if p in requirements and (p in standard_modules or not imported.get(p))]
+    drift += [(p, 'missing', 'requirements.txt') for p in packages if imported.get(p) and p not in requirements and p not in standard_modules]
+    drift += [(p, 'standard' if p in standard_modules else 'dev_unused', 'requirements_dev.txt') for p in packages if p in requirements_dev and (p in standard_modules or p not in imported)]
+    drift += [(p, 'dev_missing', 'requirements_dev.txt') for p in packages if p in imported and p not in standard_modules and p not in requirements_dev]
+    return drift
@@ -0,0 +1,102 @@
+from os.path import join, exists
+from tomllib import load as load_toml
+from typing import Literal
+from pydantic import BaseModel, ConfigDict, ValidationError
+from cli_pprinter import CLIPPrinter
+
+ADD_CATEGORIES = ('missing', 'dev_missing')
+REASONS = {
+    'missing': 'found in py files that are not test files',
+    'unused': 'Not found in py files that are not test files',
+    'standard': 'Is a standard python package and so, there is no need to be in {requirements_file}',
+    'dev_missing': 'found in py files',
+    'dev_unused': 'Not found in py files that are not test files'
+}
+
+class PolicyError(ValueError):
+    "raised (before anything is written) when the policy is 'fail' for a category that has packages, or when the policy is not valid"
+
+class Policy(BaseModel):
+    """
+    What to do with the packages of each category, without asking the user:
+        - missing: imported in py files that are not test files, but not in requirements.txt ('add', 'keep' or 'fail')
+        - unused: in requirements.txt, but not imported in py files that are not test files ('remove', 'keep' or 'fail')
+        - standard: standard python module in requirements.txt or requirements_dev.txt ('remove', 'keep' or 'fail')
+        - dev_missing: imported in py files, but not in requirements_dev.txt ('add', 'keep' or 'fail')
+        - dev_unused: in requirements_dev.txt, but not imported in py files ('remove', 'keep' or 'fail')
+    'ask' (the default) asks the user, as before.
+    """
+    model_config = ConfigDict(extra='forbid')
+    missing:Literal['ask', 'add', 'keep', 'fail'] = 'ask'
+    unused:Literal['ask', 'remove', 'keep', 'fail'] = 'ask'
+    standard:Literal['ask', 'remove', 'keep', 'fail'] = 'ask'
+    dev_missing:Literal['ask', 'add', 'keep', 'fail'] = 'ask'
+    dev_unused:Literal['ask', 'remove', 'keep', 'fail'] = 'ask'
+
+class Decision(BaseModel):
+    package:str
+    category:str
+    requirements_file:str
+    rule:str = 'ask'
+    action:str = ''
+
+def parse_policy(text:str) -> dict[str, str]:
+    "parses a policy passed as text, like 'missing=add,unused=keep'"
+    policy = {}
+    for item in text.split(','):
+        if not item.strip():
+            continue
+        if '=' not in item:
+            raise PolicyError(f"policy item {item} must be like category=action!")
+        category, action = item.split('=', 1)
+        policy[category.strip()] = action.strip()
+    return policy
+
+def load_policy(folder_path:str, policy:Policy|dict|str = None, batch:bool = False) -> Policy:
+    """
+    Returns the policy of `folder_path`: the [tool.get_requirements.policy] table of its pyproject.toml, overridden (in memory, the
+    file is not written) by `policy`. If `batch`, categories that would ask the user are kept as they are instead, so nothing is asked.
+    Raises PolicyError if a category or an action is not valid.
+    """
+    values = {}
+    pyproject_path = join(folder_path, 'pyproject.toml')
+    if exists(pyproject_path):
+        with open(pyproject_path, 'rb') as f:
+            values.update(load_toml(f).get('tool', {}).get('get_requirements', {}).get('policy', {}))
+    if isinstance(policy, str):
+        policy = parse_policy(policy)
+    elif isinstance(policy, Policy):
+        policy = policy.model_dump(exclude_unset=True)
+    values.update(policy or {})
+    try:
+        policy = Policy(**values)
+    except ValidationError as e:
+        raise PolicyError('Invalid policy: ' + ', '.join(f"{'.'.join(map(str, err['loc']))} ({err['msg']})" for err in e.errors()))
+    if batch:
+        policy = Policy(**{k:'keep' if v == 'ask' else v for k,v in policy.model_dump().items()})
+    return policy
+
+def decide(decisions:list[Decision], policy:Policy) -> list[Decision]:
+    """
+    Sets the rule and the action ('added', 'not added', 'removed' or 'maintained') of each decision, asking the user only for the
+    categories whose rule is 'ask'. All the packages whose rule is 'fail' are reported at once, before anything is asked.
+    """
+    for d in decisions:
+        d.rule = getattr(policy, d.category)
+    failed = [d for d in decisions if d.rule == 'fail']
+    if failed:
+        raise PolicyError('Policy failed for packages: ' + ', '.join(f'{d.package} ({d.category} in {d.requirements_file})' for d in failed))
+    for d in decisions:
+        add = d.category in ADD_CATEGORIES
+        if d.rule == 'ask':
+            printer = CLIPPrinter.cyan if d.category == 'dev_missing' else CLIPPrinter.yellow
+            reason = REASONS[d.category].format(requirements_file=d.requirements_file)
+            printer(f'package {d.package}: {reason}. Would you like to {"add it to" if add else "remove it from"} {d.requirements_file}? (y/n)')
+            accepted = input().lower() == 'y'
+        else:
+            accepted = d.rule != 'keep'
+        if add:
+            d.action = 'added' if accepted else 'not added'
+        else:
+            d.action = 'removed' if accepted else 'maintained'
+    return decisions
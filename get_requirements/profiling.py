@@ -0,0 +1,88 @@
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from cProfile import Profile
+from heapq import heappush, heappushpop
+from json import dump
+from time import perf_counter
+from typing import Iterator
+from cli_pprinter import CLIPPrinter
+
+class Profiler:
+    """
+    Collects the seconds spent in each stage of a run (see `stage`), counters (files, bytes, imports, ...) and the slowest files scanned.
+    Stages can be nested: read, extraction and the merge of each file are also part of the scan stage, so stages don't add up to the
+    whole run. Read and extraction seconds are summed over the files, so with many jobs they can be more than the seconds of the scan
+    stage. Shared by many projects (e.g. a batch run), stages and counters are summed over them.
+    """
+    def __init__(self, slowest:int = 10):
+        self.stages:dict[str, float] = defaultdict(float)
+        self.counters = Counter()
+        self.slowest_count = slowest
+        self._slowest:list[tuple[float, str, int, int]] = []
+
+    @contextmanager
+    def stage(self, name:str) -> Iterator[None]:
+        "adds the seconds spent inside the with block to the stage `name`"
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] += perf_counter() - start
+
+    def add_file(self, file_path:str, size:int, read_seconds:float, extract_seconds:float, imports:int):
+        "adds the stats of a scanned file"
+        self.counters['files'] += 1
+        self.counters['bytes'] += size
+        self.counters['imports'] += imports
+        self.stages['read'] += read_seconds
+        self.stages['extraction'] += extract_seconds
+        item = (read_seconds + extract_seconds, file_path, size, imports)
+        if len(self._slowest) < self.slowest_count:
+            heappush(self._slowest, item)
+        else:
+            heappushpop(self._slowest, item)
+
+    def summary(self) -> dict:
+        "returns the stages (seconds), the counters and the slowest files, slowest first"
+        return {
+            'stages': {k:round(v, 4) for k,v in self.stages.items()},
+            'counters': dict(self.counters),
+            'slowest_files': [{'file': f, 'seconds': round(s, 4), 'bytes': b, 'imports': i} for s, f, b, i in sorted(self._slowest, reverse=True)]
+        }
+
+    def summary_text(self) -> str:
+        summary = self.summary()
+        lines = ['Stages (seconds):'] + [f'  {k}: {v}' for k,v in summary['stages'].items()]
+        lines += ['Counters:'] + [f'  {k}: {v}' for k,v in summary['counters'].items()]
+        lines += ['Slowest files (seconds):'] + [f'  {f["file"]}: {f["seconds"]} ({f["bytes"]} bytes, {f["imports"]} imports)' for f in summary['slowest_files']]
+        return '\n'.join(lines)
+
+def stage(profiler:Profiler|None, name:str):
+    "returns `profiler.stage(name)`, or a context that does nothing if there is no profiler"
+    return nullcontext() if profiler is None else profiler.stage(name)
+
+@contextmanager
+def profile_run(output:str|None) -> Iterator[Profiler|None]:
+    """
+    Yields a Profiler for the run inside the with block (None if `output` is None). At the end, its summary is printed ('summary'),
+    written as json (a path ending with .json) or, for any other path, a cProfile dump of the whole run is written there (e.g. to be
+    opened with pstats or snakeviz) and the summary is printed.
+    """
+    if output is None:
+        yield None
+        return
+    profiler = Profiler()
+    cprofile = None if output == 'summary' or output.endswith('.json') else Profile()
+    if cprofile is not None:
+        cprofile.enable()
+    try:
+        yield profiler
+    finally:
+        if cprofile is not None:
+            cprofile.disable()
+            cprofile.dump_stats(output)
+        if output.endswith('.json'):
+            with open(output, 'w', encoding='utf-8') as f:
+                dump(profiler.summary(), f, indent=2)
+        else:
+            CLIPPrinter.white(profiler.summary_text())
@@ -0,0 +1,47 @@
+from mmap import mmap, ACCESS_READ
+from os import fstat
+from re import compile
+
+MMAP_THRESHOLD = 1 << 20
+HEADER_END_PATTERN = compile(rb'(?:def|class|async[ \t]+def)[ \t]|@')
+
+def _read_header(f) -> bytes:
+    "reads the lines of `f` up to the first top level def, class or decorator (outside triple quoted strings)"
+    lines = []
+    double_quotes = single_quotes = 0
+    for line in f:
+        if not (double_quotes % 2 or single_quotes % 2) and HEADER_END_PATTERN.match(line):
+            break
+        lines.append(line)
+        double_quotes += line.count(b'"""')
+        single_quotes += line.count(b"'''")
+    return b''.join(lines)
+
+def _read_import_region(mm:mmap) -> bytes:
+    "returns the bytes of `mm` up to the end of the last import statement (there is nothing to extract after it)"
+    last_import = mm.rfind(b'import')
+    if last_import == -1:
+        return b''
+    end = mm.find(b'\n', last_import)
+    if end != -1 and b'(' in mm[last_import:end]:
+        closing = mm.find(b')', end)
+        end = mm.find(b'\n', closing) if closing != -1 else -1
+    return mm[:] if end == -1 else mm[:end + 1]
+
+def read_source(file_path:str, header_only:bool = False) -> bytes:
+    """
+    Reads the py file `file_path` as bytes (they are never decoded, `ast` handles the encoding declared in the file).
+
+    Small files are read at once. Files bigger than MMAP_THRESHOLD are memory mapped and only the part up to the last line with
+    `import` is copied, so files without imports (or with them only at the top, like generated ones) are not loaded. With `header_only`,
+    reading stops at the first top level def, class or decorator, so memory doesn't grow with the size of the file, but imports made
+    after that (e.g. inside functions) are not seen.
+    """
+    with open(file_path, 'rb') as f:
+        if header_only:
+            return _read_header(f)
+        size = fstat(f.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            return f.read()
+        with mmap(f.fileno(), 0, access=ACCESS_READ) as mm:
+            return _read_import_region(mm)
@@ -0,0 +1,73 @@
+from functools import lru_cache
+from json import dumps
+from os.path import join, dirname
+from typing import Iterator, TYPE_CHECKING
+from file_handler import FileHandler
+if TYPE_CHECKING:
+    from .run import PackagesInfo
+
+REPORT_FORMATS = ('text', 'json', 'jsonl')
+REPORT_SECTIONS = {
+    'standard_packages_not_needed_anymore_text': ('requirements.txt', ('unused', 'standard')),
+    'new_standard_packages_to_be_included_text': ('requirements.txt', ('missing',)),
+    'dev_packages_not_needed_anymore_text': ('requirements_dev.txt', ('dev_unused', 'standard')),
+    'new_dev_packages_to_be_included_text': ('requirements_dev.txt', ('dev_missing',))
+}
+
+@lru_cache(maxsize=1)
+def load_report_template() -> str:
+    "returns report_template.txt, read only once"
+    return FileHandler.load(join(dirname(__file__), 'report_template.txt'), load_first_value=True)
+
+def render_report(pi:'PackagesInfo', folder_path:str) -> str:
+    "returns the text report of the decisions of `pi`, rendered from report_template.txt"
+    lines = {k:[] for k in REPORT_SECTIONS}
+    for d in pi.decisions:
+        for section, (requirements_file, categories) in REPORT_SECTIONS.items():
+            if d.requirements_file == requirements_file and d.category in categories:
+                lines[section].append(f'\n--{d.package}{"(standard python module)" if d.category == "standard" else ""}: {d.action}')
+    return load_report_template().format(
+        folder_path=folder_path,
+        **{k:''.join(v) or "\nNo packages found in this situation!" for k,v in lines.items()}
+    )
+
+def package_records(pi:'PackagesInfo', folder_path:str) -> Iterator[dict]:
+    "yields a dict per package of `pi` (sorted by name) with its classification, the files importing it and the decisions about it"
+    decisions = {}
+    for d in pi.decisions:
+        decisions.setdefault(d.package, []).append({'category': d.category, 'requirements_file': d.requirements_file, 'rule': d.rule, 'action': d.action})
+    for package, info in sorted(pi.packages_in_files.items()):
+        yield {
+            'folder_path': folder_path,
+            'package': package,
+            'is_standard_module': info.is_standard_module,
+            'is_on_standard_files': info.is_on_standard_files,
+            'is_on_requirements_file': info.is_on_requirements_file,
+            'is_on_requirements_dev_file': info.is_on_requirements_dev_file,
+            'files': info.files,
+            'decisions': decisions.get(package, [])
+        }
+
+def report_dict(pi:'PackagesInfo', folder_path:str) -> dict:
+    "returns the structured report of `pi`: requirements before and after the decisions and a record per package (see `package_records`)"
+    return {
+        'folder_path': folder_path,
+        'requirements_packages': sorted(pi.requirements_packages),
+        'requirements_dev_packages': sorted(pi.requirements_dev_packages),
+        'new_requirements_packages': sorted(pi.new_requirements_packages),
+        'new_requirements_dev_packages': sorted(pi.new_requirements_dev_packages),
+        'packages': list(package_records(pi, folder_path))
+    }
+
+def format_report(pi:'PackagesInfo', folder_path:str, report_format:str = 'text') -> str:
+    """
+    returns the report of `pi` as 'text' (report_template.txt), 'json' (see `report_dict`) or 'jsonl' (a json line per package, see
+    `package_records`, so reports of many projects can be streamed one after the other)
+    """
+    if report_format == 'text':
+        return render_report(pi, folder_path)
+    if report_format == 'json':
+        return dumps(report_dict(pi, folder_path), indent=2)
+    if report_format == 'jsonl':
+        return ''.join(dumps(r) + '\n' for r in package_records(pi, folder_path))
+    raise ValueError(f"report_format {report_format} is not valid! Use one of {', '.join(REPORT_FORMATS)}")
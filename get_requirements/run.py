@@ -1,13 +1,25 @@
-from os.path import isfile, exists, join, basename, dirname
+from os.path import exists, join
 from os import getcwd
-from glob import glob
-from re import MULTILINE, finditer
 from argparse import ArgumentParser
+from json import dumps
+from contextlib import nullcontext, redirect_stdout
+import sys
 from pydantic import BaseModel
 from cli_pprinter import CLIPPrinter
 from file_handler import FileHandler
 from datetime import datetime, UTC
 from .get_standard_python_libraries import get_standard_python_libraries
+from .scanner import scan_files
+from .cache import ScanCache, CACHE_FILE_NAME, open_scan_cache
+from .walker import walk_py_files
+from .imports import get_top_level_modules
+from .policy import Decision, Policy, PolicyError, load_policy, decide
+from .distributions import get_distribution_resolver
+from .index import ModuleIndex, requirements_drift
+from .graph import ImportGraph
+from .profiling import Profiler, profile_run, stage
+from .report import REPORT_FORMATS, render_report, format_report
+from .cli import add_scan_arguments
 
 class CToolStringArgs(BaseModel):
     folder_path:str|None
@@ -26,9 +38,16 @@ class PackagesInfo(BaseModel):
     new_requirements_packages:set = set()
     new_requirements_dev_packages:set = set()
     report:str = ''
+    decisions:list[Decision] = []
   
-def get_modules_needed_to_install(folder_path:str, requirements_file_path:str, requirements_dev_file_path:str) -> PackagesInfo:
-    "returns imported modules in py files in `folder_path`"
+def _load_requirements(requirements_file_path:str) -> set[str]:
+    "returns the packages in `requirements_file_path` (empty if it doesn't exist)"
+    if not exists(requirements_file_path):
+        return set()
+    return set(FileHandler.load(requirements_file_path, load_first_value=True).splitlines())
+
+def get_modules_needed_to_install(folder_path:str, requirements_file_path:str, requirements_dev_file_path:str, jobs:int = 1, executor:str = 'thread', use_cache:bool = False, cache_hash:bool = False, excludes:list[str] = None, use_default_excludes:bool = True, use_gitignore:bool = True, python_version:str = None, header_only:bool = False, cache:ScanCache = None, resolve_distributions:bool = True, quiet:bool = False, profiler:Profiler = None, graph:ImportGraph = None) -> PackagesInfo:
+    "returns imported modules (or the distributions that provide them, if `resolve_distributions`) in py files in `folder_path`, except the ones defined in it"
     CToolStringArgs(
         folder_path=folder_path
     )
@@ -36,50 +55,71 @@ def get_modules_needed_to_install(folder_path:str, requirements_file_path:str, r
         folder_path = getcwd()
     if not exists(folder_path):
         raise ValueError(f"folder_path {folder_path} doesn't exist!")
-    already_in_requirements_file = set()
-    if exists(requirements_file_path):
-        already_in_requirements_file = set(FileHandler.load(requirements_file_path, load_first_value=True).splitlines())
-    already_in_requirements_dev_file = set()
-    if exists(requirements_dev_file_path):
-        already_in_requirements_dev_file = set(FileHandler.load(requirements_dev_file_path, load_first_value=True).splitlines())
-    file_paths = [f for f in glob(f'{folder_path}/**/*', recursive=True) if isfile(f) and f[-3:] == '.py']
-    pi = PackagesInfo(
-        requirements_packages=already_in_requirements_file,
-        requirements_dev_packages=already_in_requirements_dev_file,
-        new_requirements_packages=already_in_requirements_file,
-        new_requirements_dev_packages=already_in_requirements_dev_file
-    )
+    with stage(profiler, 'requirements'):
+        already_in_requirements_file = _load_requirements(requirements_file_path)
+        already_in_requirements_dev_file = _load_requirements(requirements_dev_file_path)
+    if graph is None:
+        graph = ImportGraph(folder_path)
+    with stage(profiler, 'discovery'):
+        file_paths = list(walk_py_files(folder_path, excludes=excludes, use_default_excludes=use_default_excludes, use_gitignore=use_gitignore, graph=graph))
+    if profiler is not None:
+        profiler.counters['discovered'] += len(file_paths)
     if not file_paths:
         CLIPPrinter.red(f'No py files found in {folder_path}!')
-        return pi
-    standard_modules = get_standard_python_libraries()
-    pattern = r'^(?!\s*#)\s*(?:from\s+(\S+)\s+import\s+\S+|import\s+(\S+))'
-    for file in file_paths:
-        CLIPPrinter.white(f"Checking file {file}")
-        data = FileHandler.load(file_paths=file, load_first_value=True, progress_bar=False)
-        matches = finditer(pattern, data, MULTILINE)
-        modules_found = [f.group(1).lower() if f.group(1) else f.group(2).lower() for f in matches]
-        modules_found = [f.split('.')[0] for f in modules_found]
-        modules_found = [f for f in modules_found if f != '']
-        for mf in modules_found:
-            if mf not in pi.packages_in_files:
-                pi.packages_in_files[mf] = Package()
-            if not file.endswith('_test.py') and not basename(file).startswith('test_') and not basename(file) == 'conftest.py':
-                pi.packages_in_files[mf].is_on_standard_files = True
-            if mf in standard_modules:
-                pi.packages_in_files[mf].is_standard_module = True
-            pi.packages_in_files[mf].files.append(file)
-            if mf in pi.requirements_packages:
-                pi.packages_in_files[mf].is_on_requirements_file = True
-            if mf in pi.requirements_dev_packages:
-                pi.packages_in_files[mf].is_on_requirements_dev_file = True
-    for mod_in_req in pi.requirements_packages:
+        return PackagesInfo(
+            requirements_packages=already_in_requirements_file,
+            requirements_dev_packages=already_in_requirements_dev_file,
+            new_requirements_packages=already_in_requirements_file,
+            new_requirements_dev_packages=already_in_requirements_dev_file
+        )
+    with stage(profiler, 'standard_modules'):
+        standard_modules = get_standard_python_libraries(python_version)
+    with stage(profiler, 'distributions'):
+        resolver = get_distribution_resolver() if resolve_distributions else None
+    own_cache = use_cache and cache is None
+    if own_cache:
+        cache = open_scan_cache(join(folder_path, CACHE_FILE_NAME), header_only=header_only, python_version=python_version, use_hash=cache_hash)
+    index = ModuleIndex()
+    with stage(profiler, 'scan'):
+        for file, records in scan_files(file_paths, jobs=jobs, executor=executor, cache=cache, header_only=header_only, profiler=profiler):
+            if not quiet:
+                CLIPPrinter.white(f"Checking file {file}")
+            with stage(profiler, 'merge'):
+                records = graph.add_file(file, records)
+                index.add_file(file, resolver.requirement_names(records, standard_modules) if resolver else get_top_level_modules(records))
+    if own_cache:
+        cache.save()
+        CLIPPrinter.white(f'Scan cache: {cache.hits} hits, {cache.misses} misses')
+    if profiler is not None:
+        profiler.counters['modules'] += len(index.modules)
+        if own_cache:
+            profiler.counters.update({'cache_hits': cache.hits, 'cache_misses': cache.misses})
+    with stage(profiler, 'merge'):
+        return _packages_info(index, already_in_requirements_file, already_in_requirements_dev_file, standard_modules)
+
+def _packages_info(index:ModuleIndex, requirements_packages:set[str], requirements_dev_packages:set[str], standard_modules:frozenset) -> PackagesInfo:
+    "converts `index` to PackagesInfo, adding the packages in requirements.txt and requirements_dev.txt"
+    pi = PackagesInfo(
+        requirements_packages=requirements_packages,
+        requirements_dev_packages=requirements_dev_packages,
+        new_requirements_packages=set(requirements_packages),
+        new_requirements_dev_packages=set(requirements_dev_packages)
+    )
+    for mf in index.modules:
+        pi.packages_in_files[mf] = Package(
+            files=index.module_files(mf),
+            is_on_standard_files=index.is_on_standard_files(mf),
+            is_standard_module=mf in standard_modules,
+            is_on_requirements_file=mf in requirements_packages,
+            is_on_requirements_dev_file=mf in requirements_dev_packages
+        )
+    for mod_in_req in requirements_packages:
         if mod_in_req not in pi.packages_in_files:
             pi.packages_in_files[mod_in_req] = Package()
         pi.packages_in_files[mod_in_req].is_on_requirements_file = True
         if mod_in_req in standard_modules:
             pi.packages_in_files[mod_in_req].is_standard_module = True
-    for mod_in_req_dev in pi.requirements_dev_packages:
+    for mod_in_req_dev in requirements_dev_packages:
         if mod_in_req_dev not in pi.packages_in_files:
             pi.packages_in_files[mod_in_req_dev] = Package()
         pi.packages_in_files[mod_in_req_dev].is_on_requirements_dev_file = True
@@ -87,12 +127,31 @@ def get_modules_needed_to_install(folder_path:str, requirements_file_path:str, r
             pi.packages_in_files[mod_in_req_dev].is_standard_module = True
     return pi
 
-def get_requirements(folder_path:str = None, write_requirements_file:bool = True, requirements_file_path:str = None, requirements_dev_file_path:str = None, write_requirements_generated:bool = True) -> PackagesInfo:
+def _get_decisions(pi:PackagesInfo) -> list[Decision]:
+    "returns the packages of `pi` to be added to or removed from requirements.txt and requirements_dev.txt, still to be decided"
+    imported = {p:v.is_on_standard_files for p,v in pi.packages_in_files.items() if v.files}
+    standard_modules = {p for p,v in pi.packages_in_files.items() if v.is_standard_module}
+    return [
+        Decision(package=p, category=category, requirements_file=requirements_file)
+        for p, category, requirements_file in requirements_drift(imported, pi.requirements_packages, pi.requirements_dev_packages, standard_modules)
+    ]
+
+def _apply_decisions(pi:PackagesInfo):
+    "adds to (or removes from) the new requirements sets of `pi` the packages of its decisions"
+    for d in pi.decisions:
+        new_packages = pi.new_requirements_packages if d.requirements_file == 'requirements.txt' else pi.new_requirements_dev_packages
+        if d.action == 'added':
+            new_packages.add(d.package)
+        elif d.action == 'removed':
+            new_packages.remove(d.package)
+
+def get_requirements(folder_path:str = None, write_requirements_file:bool = True, requirements_file_path:str = None, requirements_dev_file_path:str = None, write_requirements_generated:bool = True, jobs:int = 1, executor:str = 'thread', use_cache:bool = False, cache_hash:bool = False, excludes:list[str] = None, use_default_excludes:bool = True, use_gitignore:bool = True, python_version:str = None, header_only:bool = False, policy:Policy|dict|str = None, batch:bool = False, cache:ScanCache = None, resolve_distributions:bool = True, quiet:bool = False, profiler:Profiler = None, report_format:str|None = 'text', graph:ImportGraph = None) -> PackagesInfo:
     """
     Assess packages being imported in py files inside a given folder in relation to the requirements.txt and requirements_dev.txt files.
     
     User can choose to remove (if package is not being imported anymore but it's in requirements) or add (if package is being imported 
-    but not in requirements) packages to the requirements.txt and requirements_dev.txt files.
+    but not in requirements) packages to the requirements.txt and requirements_dev.txt files. The choices can also be made by a policy
+    (see `Policy`), without asking the user, so it can run in CI.
     
     Creates a report with the differences between the current requirements.txt and requirements_dev.txt and the new ones after considering 
     the user's choices.
@@ -103,6 +162,23 @@ def get_requirements(folder_path:str = None, write_requirements_file:bool = True
         requirements_file_path (str, optional): path to the requirements.txt file. Defaults to None (will use folder_path/requirements.txt)
         requirements_dev_file_path (str, optional): path to the requirements_dev.txt file. Defaults to None (will use folder_path/requirements_dev.txt
         write_requirements_generated (bool, optional): will write a file with the date and time the requirements were generated. Defaults to True.
+        jobs (int, optional): number of workers used to scan the py files. Defaults to 1. 0 uses one worker per cpu.
+        executor (str, optional): how the workers run: 'serial', 'thread' (I/O bound, e.g. network filesystems) or 'process' (cpu bound). Defaults to 'thread'.
+        use_cache (bool, optional): keeps the imports found in each py file in folder_path/.get_requirements_cache, so next runs only scan added or changed files. Defaults to False.
+        cache_hash (bool, optional): also keeps the content hash of each file, so files whose mtime changed but content didn't are not scanned again. Defaults to False.
+        excludes (list[str], optional): glob patterns of files and folders to skip, matched against their name and their path relative to folder_path. Defaults to None.
+        use_default_excludes (bool, optional): also skips __pycache__, venv, node_modules, build, dist, egg-info and virtualenv folders. Hidden files and folders are always skipped. Defaults to True.
+        use_gitignore (bool, optional): also skips files and folders ignored by the .gitignore files inside folder_path. Defaults to True.
+        python_version (str, optional): python version (e.g. '3.12') used to tell which modules are standard. Defaults to None (the running python).
+        header_only (bool, optional): only reads each py file up to its first top level def/class, so huge files are not loaded. Imports made after that (e.g. inside functions) are not found. Defaults to False.
+        policy (Policy|dict|str, optional): what to do with each category of packages ('missing', 'unused', 'standard', 'dev_missing', 'dev_unused'), e.g. {'missing': 'add', 'unused': 'fail'} or 'missing=add,unused=fail'. Overrides the [tool.get_requirements.policy] table of folder_path/pyproject.toml (the file is not written). Defaults to None (asks the user).
+        batch (bool, optional): never asks the user: categories without a policy are kept as they are. Defaults to False.
+        cache (ScanCache, optional): scan cache shared with other calls (e.g. of other projects), used instead of use_cache. It's not saved. Defaults to None.
+        quiet (bool, optional): doesn't print each file checked (printing is slow on big folders). Defaults to False.
+        report_format (str, optional): how the report is printed: 'text' (also kept in the report attribute), 'json' or 'jsonl' (see `get_requirements.report`). None doesn't render it (it can be rendered later with `render_report` or `format_report`). Defaults to 'text'.
+        profiler (Profiler, optional): gets the seconds of each stage (discovery, read, extraction, merge, decide, write, report, ...), counters (files, bytes, imports, ...) and the slowest files. Defaults to None.
+        resolve_distributions (bool, optional): uses the name of the distribution that provides each imported module (e.g. pyyaml for yaml, scikit-learn for sklearn, protobuf for google.protobuf), from the installed packages metadata and a bundled table. Defaults to True.
+        graph (ImportGraph, optional): gets the local modules of folder_path and the imports between its py files, e.g. to find the files pulling in a package with `graph.files_pulling_in`. Modules defined in folder_path are never taken as packages to install. Defaults to None.
         
     Returns:
         PacakagesInfo:
@@ -111,7 +187,8 @@ def get_requirements(folder_path:str = None, write_requirements_file:bool = True
             - requirements_dev_packages (set): set with modules in requirements_dev.txt
             - new_requirements_packages (set): set with modules after considering the user's choices
             - new_requirements_dev_packages (set): set with modules for dev after considering the user's choices
-            - report (str): text with the differences between the current requirements.txt and requirements_dev.txt and the new ones after considering the user's choices
+            - report (str): (only if report_format is 'text') text with the differences between the current requirements.txt and requirements_dev.txt and the new ones after considering the user's choices
+            - decisions (list): the choice made (by the user or by the policy) for each package, with package, category, requirements_file, rule and action
             - packages_in_files (dict): dict with modules being imported in py files and the files they are being imported from with the following attributes:
                 - files (list): list of files the module is being imported from
                 - is_on_standard_files (bool): True if the module is being imported from a standard file
@@ -119,6 +196,8 @@ def get_requirements(folder_path:str = None, write_requirements_file:bool = True
                 - is_on_requirements_file (bool): True if the module is in requirements.txt
                 - is_on_requirements_dev_file (bool): True if the module is in requirements_dev.txt
     """
+    if folder_path is None:
+        folder_path = getcwd()
     if requirements_file_path is None:
         requirements_file_path = join(folder_path, 'requirements.txt')
     if requirements_dev_file_path is None:
@@ -126,82 +205,37 @@ def get_requirements(folder_path:str = None, write_requirements_file:bool = True
     pi = get_modules_needed_to_install(
         folder_path=folder_path,
         requirements_file_path=requirements_file_path,
-        requirements_dev_file_path=requirements_dev_file_path
-    )
-    standard_packages_not_needed_anymore_text = "\nNo packages found in this situation!"
-    new_standard_packages_to_be_included_text = "\nNo packages found in this situation!"
-    dev_packages_not_needed_anymore_text = "\nNo packages found in this situation!"
-    new_dev_packages_to_be_included_text = "\nNo packages found in this situation!"
-    standard_packages_not_needed_anymore = {k:v for k,v in pi.packages_in_files.items() if (not v.is_on_standard_files or v.is_standard_module) and v.is_on_requirements_file}
-    if standard_packages_not_needed_anymore:
-        standard_packages_not_needed_anymore_text = ''
-        for p in sorted(standard_packages_not_needed_anymore):
-            warn_text = 'Not found in py files that are not test files'
-            is_standard_warn_text = ''
-            if standard_packages_not_needed_anymore[p].is_standard_module:
-                warn_text = 'Is a standard python package and so, there is no need to be in requirements.txt'
-                is_standard_warn_text = "(standard python module)"
-            standard_packages_not_needed_anymore_text += f'\n--{p}{is_standard_warn_text}: '
-            CLIPPrinter.yellow(f'package {p}: {warn_text}. Would you like to remove it from requirements.txt? (y/n)')
-            if input().lower() == 'y':
-                pi.new_requirements_packages.remove(p)
-                standard_packages_not_needed_anymore_text += 'removed'
-            else:
-                standard_packages_not_needed_anymore_text += 'maintained'
-    new_standard_packages_to_be_included = [k for k,v in pi.packages_in_files.items() if v.is_on_standard_files and not v.is_on_requirements_file and not v.is_standard_module]
-    if new_standard_packages_to_be_included:
-        new_standard_packages_to_be_included_text = ''
-        for p in sorted(new_standard_packages_to_be_included):
-            new_standard_packages_to_be_included_text += f'\n--{p}: '
-            CLIPPrinter.yellow(f'package {p}: found in py files that are not test files. Would you like to add it to requirements.txt? (y/n)')
-            if input().lower() == 'y':
-                pi.new_requirements_packages.add(p)
-                new_standard_packages_to_be_included_text += 'added'
-            else:
-                new_standard_packages_to_be_included_text += 'not added'
-    if write_requirements_file:
-        FileHandler.write({requirements_file_path: '\n'.join(sorted(pi.new_requirements_packages))})
-
-    dev_packages_not_needed_anymore = {k:v for k,v in pi.packages_in_files.items() if (not v.files or v.is_standard_module) and v.is_on_requirements_dev_file}
-    if dev_packages_not_needed_anymore:
-        dev_packages_not_needed_anymore_text = ""
-        for p in sorted(dev_packages_not_needed_anymore):
-            warn_text = 'Not found in py files that are not test files'
-            is_standard_warn_text = ''
-            if dev_packages_not_needed_anymore[p].is_standard_module:
-                warn_text = 'Is a standard python package and so, there is no need to be in requirements_dev.txt'
-                is_standard_warn_text = "(standard python module)"
-            dev_packages_not_needed_anymore_text += f'\n--{p}{is_standard_warn_text}: '
-            CLIPPrinter.yellow(f'package {p}: {warn_text}. Would you like to remove it from requirements_dev.txt? (y/n)')
-            if input().lower() == 'y':
-                pi.new_requirements_dev_packages.remove(p)
-                dev_packages_not_needed_anymore_text += 'removed'
-            else:
-                dev_packages_not_needed_anymore_text += 'maintained'
-    new_dev_packages_to_be_included = [k for k,v in pi.packages_in_files.items() if v.files and not v.is_standard_module and not v.is_on_requirements_dev_file ]
-    if new_dev_packages_to_be_included:
-        new_dev_packages_to_be_included_text = ''
-        for p in sorted(new_dev_packages_to_be_included):
-            new_dev_packages_to_be_included_text += f'\n--{p}: '
-            CLIPPrinter.cyan(f'package {p}: found in py files. Would you like to add it to requirements_dev.txt? (y/n)')
-            if input().lower() == 'y':
-                pi.new_requirements_dev_packages.add(p)
-                new_dev_packages_to_be_included_text += 'added'
-            else:
-                new_dev_packages_to_be_included_text += 'not added'
-    if write_requirements_file:
-        FileHandler.write({requirements_dev_file_path: '\n'.join(sorted(pi.new_requirements_dev_packages))})
-    if write_requirements_generated:
-        FileHandler.write({join(folder_path, '.requirements_generated'): f'{datetime.now(UTC).isoformat()}'})
-    report = FileHandler.load(join(dirname(__file__), 'report_template.txt'), load_first_value=True)
-    pi.report = report.format(
-        folder_path=folder_path,
-        standard_packages_not_needed_anymore_text=standard_packages_not_needed_anymore_text,
-        new_standard_packages_to_be_included_text=new_standard_packages_to_be_included_text,
-        dev_packages_not_needed_anymore_text=dev_packages_not_needed_anymore_text,
-        new_dev_packages_to_be_included_text=new_dev_packages_to_be_included_text
+        requirements_dev_file_path=requirements_dev_file_path,
+        jobs=jobs,
+        executor=executor,
+        use_cache=use_cache,
+        cache_hash=cache_hash,
+        excludes=excludes,
+        use_default_excludes=use_default_excludes,
+        use_gitignore=use_gitignore,
+        python_version=python_version,
+        header_only=header_only,
+        cache=cache,
+        resolve_distributions=resolve_distributions,
+        quiet=quiet,
+        profiler=profiler,
+        graph=graph
     )
-    CLIPPrinter.green(pi.report)
+    with stage(profiler, 'decide'):
+        pi.decisions = decide(_get_decisions(pi), load_policy(folder_path, policy, batch))
+        _apply_decisions(pi)
+    with stage(profiler, 'write'):
+        if write_requirements_file:
+            FileHandler.write({requirements_file_path: '\n'.join(sorted(pi.new_requirements_packages))})
+            FileHandler.write({requirements_dev_file_path: '\n'.join(sorted(pi.new_requirements_dev_packages))})
+        if write_requirements_generated:
+            FileHandler.write({join(folder_path, '.requirements_generated'): f'{datetime.now(UTC).isoformat()}'})
+    with stage(profiler, 'report'):
+        if report_format == 'text':
+            pi.report = render_report(pi, folder_path)
+            CLIPPrinter.green(pi.report)
+        elif report_format is not None:
+            print(format_report(pi, folder_path, report_format), end='')
     return pi
 
 def cli():
@@ -210,24 +244,135 @@ def cli():
         "\nUser can choose to remove (if package is not being imported anymore but it's in requirements) or add (if package is being imported but not in requirements) packages to the requirements.txt and requirements_dev.txt files."\
         "\nCreates a report with the differences between the current requirements.txt and requirements_dev.txt and the new ones after considering the user's choices."
     )
-    parser.add_argument("-f", help="Path to the folder to search in. Default to current directory if not passed")
+    add_scan_arguments(parser)
     parser.add_argument("-dw", action='store_true', help="Don't write the requirements.txt file, only find the differences between the existing one and what is needed!")
     parser.add_argument("-dwg", action='store_true', help="Don't write the requirements_generated file!")
-    parser.add_argument("-rf", help="Relative path to the requirements.txt file. Default to folder_path/requirements.txt")
-    parser.add_argument("-rdf", help="Relative path to the requirements_dev.txt file. Default to folder_path/requirements_dev.txt")
+    parser.add_argument("-c", "--cache", action='store_true', help="Keep the imports found in each py file in folder_path/.get_requirements_cache and only scan added or changed files")
+    parser.add_argument("-ch", "--cache-hash", action='store_true', help="With -c, also compare the content hash of files whose mtime changed")
+    parser.add_argument("-p", "--policy", help="What to do with each category of packages without asking, e.g. missing=add,unused=remove,standard=remove,dev_missing=keep,dev_unused=fail. Overrides [tool.get_requirements.policy] of pyproject.toml (the file is not written)")
+    parser.add_argument("-b", "--batch", action='store_true', help="Never ask: categories without a policy are kept as they are")
+    parser.add_argument("--projects", nargs='+', help="Folders of many projects to process in one run (never asks, see -b). -f, -rf and -rdf are ignored")
+    parser.add_argument("--manifest", help="File with the folders of many projects to process in one run, one per line")
+    parser.add_argument("-pj", "--project-jobs", type=int, default=4, help="Number of projects processed at the same time with --projects/--manifest. Default to 4")
+    parser.add_argument("-o", "--output", help="Path of the report, in the --format given (json by default with --projects/--manifest, with the results of all projects)")
+    parser.add_argument("--format", choices=REPORT_FORMATS, default='text', help="Format of the report: text, json or jsonl (a json line per package, streamed project by project with --projects/--manifest). Default to text")
+    parser.add_argument("-w", "--watch", action='store_true', help="Keep watching the folder, scanning again only the changed py files and printing the report whenever it changes (never asks, see -b). Requirements files are only written with -p")
+    parser.add_argument("--debounce", type=float, default=0.3, help="With --watch, seconds without changes before handling them. Default to 0.3")
+    parser.add_argument("--poll", action='store_true', help="With --watch, poll the files instead of using inotify")
+    parser.add_argument("--check", action='store_true', help="Only check that the requirements files match the imports (nothing is asked or written) and exit with 1 if they don't. Fast: doesn't load pydantic and the other dependencies")
+    parser.add_argument("--why", action='append', default=[], help="Print the files pulling in this module (as imported, e.g. yaml), directly or through local modules. Can be passed many times")
+    parser.add_argument("-q", "--quiet", action='store_true', help="Don't print each file checked (faster on big folders)")
+    parser.add_argument("--profile", nargs='?', const='summary', help="Print the seconds of each stage, counters and the slowest files. With a path ending with .json, write them there instead. With any other path, also write a cProfile dump of the run there")
     args = parser.parse_args()
-    if not args.f:
-        folder_path = getcwd()
-    else:
-        folder_path = args.f
-    CLIPPrinter.white(f'making requirements.txt based on folder {folder_path}!')
-    return get_requirements(
-        folder_path=folder_path,
-        write_requirements_file=not args.dw,
-        requirements_file_path=args.rf,
-        requirements_dev_file_path=args.rdf,
-        write_requirements_generated=not args.dwg
-    )
+    if args.check:
+        from .cli import main
+        return main()
+    if args.watch:
+        from .watch import watch
+        return watch(
+            folder_path=args.f,
+            requirements_file_path=args.rf,
+            requirements_dev_file_path=args.rdf,
+            write_requirements_file=bool(args.policy) and not args.dw,
+            policy=args.policy,
+            debounce=args.debounce,
+            use_polling=args.poll,
+            jobs=args.jobs,
+            executor=args.executor,
+            python_version=args.python_version,
+            header_only=args.header_only,
+            resolve_distributions=not args.no_resolve,
+            excludes=args.exclude,
+            use_default_excludes=not args.no_default_excludes,
+            use_gitignore=not args.no_gitignore
+        )
+    quiet = args.quiet or (args.format != 'text' and not args.output)
+    # a json/jsonl report printed to stdout must be the only thing there, so anything else printed goes to stderr
+    stdout = sys.stdout
+    with redirect_stdout(sys.stderr) if args.format != 'text' and not args.output else nullcontext(), profile_run(args.profile) as profiler:
+        if args.projects or args.manifest:
+            from .batch import get_requirements_for_projects, load_manifest, write_projects_report, write_project_jsonl
+            folder_paths = list(args.projects or []) + (load_manifest(args.manifest) if args.manifest else [])
+            stream = None
+            if args.format == 'jsonl':
+                stream = open(args.output, 'w', encoding='utf-8') if args.output else stdout
+            try:
+                results = get_requirements_for_projects(
+                    folder_paths,
+                    project_jobs=args.project_jobs,
+                    use_cache=args.cache,
+                    cache_hash=args.cache_hash,
+                    policy=args.policy,
+                    header_only=args.header_only,
+                    python_version=args.python_version,
+                    on_result=None if stream is None else lambda project: write_project_jsonl(project, stream),
+                    write_requirements_file=not args.dw,
+                    write_requirements_generated=not args.dwg,
+                    jobs=args.jobs,
+                    executor=args.executor,
+                    excludes=args.exclude,
+                    use_default_excludes=not args.no_default_excludes,
+                    use_gitignore=not args.no_gitignore,
+                    resolve_distributions=not args.no_resolve,
+                    quiet=quiet,
+                    profiler=profiler,
+                    report_format='text' if args.format == 'text' else None
+                )
+            finally:
+                if stream is not None and stream is not stdout:
+                    stream.close()
+            if args.format != 'jsonl':
+                report = write_projects_report(results, args.output)
+                if args.format == 'json' and not args.output:
+                    print(dumps(report, indent=2), file=stdout)
+            for folder_path, project in results.items():
+                if project.error:
+                    CLIPPrinter.red(f'{folder_path}: {project.error}')
+            if any(project.error for project in results.values()):
+                raise SystemExit(1)
+            return results
+        if not args.f:
+            folder_path = getcwd()
+        else:
+            folder_path = args.f
+        if not quiet:
+            CLIPPrinter.white(f'making requirements.txt based on folder {folder_path}!')
+        graph = ImportGraph(folder_path) if args.why else None
+        try:
+            result = get_requirements(
+                folder_path=folder_path,
+                write_requirements_file=not args.dw,
+                requirements_file_path=args.rf,
+                requirements_dev_file_path=args.rdf,
+                write_requirements_generated=not args.dwg,
+                jobs=args.jobs,
+                executor=args.executor,
+                use_cache=args.cache,
+                cache_hash=args.cache_hash,
+                excludes=args.exclude,
+                use_default_excludes=not args.no_default_excludes,
+                use_gitignore=not args.no_gitignore,
+                python_version=args.python_version,
+                header_only=args.header_only,
+                policy=args.policy,
+                batch=args.batch,
+                resolve_distributions=not args.no_resolve,
+                quiet=quiet,
+                profiler=profiler,
+                report_format='text' if args.format == 'text' and not args.output else None,
+                graph=graph
+            )
+        except PolicyError as e:
+            CLIPPrinter.red(str(e))
+            raise SystemExit(1)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(format_report(result, folder_path, args.format))
+        elif args.format != 'text':
+            print(format_report(result, folder_path, args.format), end='', file=stdout)
+        for module in args.why:
+            CLIPPrinter.white('\n'.join([f'files pulling in {module}:'] + [f'--{f}' for f in graph.files_pulling_in(module)]))
+        return result
 
 if __name__ == '__main__':
     cli()
\ No newline at end of file
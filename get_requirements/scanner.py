@@ -0,0 +1,106 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from itertools import islice
+from os import cpu_count
+from time import perf_counter
+from typing import Iterable, Iterator, TYPE_CHECKING
+from .imports import ImportRecord, extract_imports, get_top_level_modules, records_from_json
+from .reader import read_source
+if TYPE_CHECKING:
+    from .cache import ScanCache
+    from .profiling import Profiler
+
+EXECUTORS = ('serial', 'thread', 'process')
+SCANNER_VERSION = '3'
+
+def scan_file(file_path:str, header_only:bool = False) -> list[ImportRecord]:
+    "returns the imports of the py file `file_path`, in the order they are found (only the ones before the first top level def/class if `header_only`)"
+    return extract_imports(read_source(file_path, header_only=header_only))
+
+def get_modules_in_file(file_path:str) -> list[str]:
+    "returns the top level modules imported in the py file `file_path`, in the order they are found"
+    return get_top_level_modules(scan_file(file_path))
+
+def _scan_file_timed(file_path:str, header_only:bool = False) -> tuple[list[ImportRecord], int, float, float]:
+    "returns the imports of `file_path`, its size read and the seconds spent reading and extracting"
+    start = perf_counter()
+    source = read_source(file_path, header_only=header_only)
+    read_end = perf_counter()
+    records = extract_imports(source)
+    return records, len(source), read_end - start, perf_counter() - read_end
+
+def _scan_chunk(file_paths:list[str], header_only:bool, timed:bool = False) -> list:
+    scan = _scan_file_timed if timed else scan_file
+    return [scan(f, header_only) for f in file_paths]
+
+def _profiled(results:Iterator[tuple[str, tuple]], profiler:'Profiler') -> Iterator[tuple[str, list[ImportRecord]]]:
+    for file_path, (records, size, read_seconds, extract_seconds) in results:
+        profiler.add_file(file_path, size, read_seconds, extract_seconds, len(records))
+        yield file_path, records
+
+def _chunks(file_paths:Iterable[str], chunk_size:int) -> Iterator[list[str]]:
+    file_paths = iter(file_paths)
+    while chunk := list(islice(file_paths, chunk_size)):
+        yield chunk
+
+def _scan_files_cached(file_paths:Iterable[str], cache:'ScanCache', **kwargs) -> Iterator[tuple[str, list[ImportRecord]]]:
+    in_order = deque()
+    def not_cached():
+        for file_path in file_paths:
+            records = cache.get(file_path)
+            in_order.append((file_path, None if records is None else records_from_json(records)))
+            if records is None:
+                yield file_path
+    for file_path, records in scan_files(not_cached(), **kwargs):
+        while in_order[0][1] is not None:
+            yield in_order.popleft()
+        in_order.popleft()
+        cache.set(file_path, records)
+        yield file_path, records
+    yield from in_order
+
+def scan_files(file_paths:Iterable[str], jobs:int = 1, executor:str = 'thread', chunk_size:int = 64, cache:'ScanCache' = None, header_only:bool = False, profiler:'Profiler' = None) -> Iterator[tuple[str, list[ImportRecord]]]:
+    """
+    Yields `(file_path, imports)` for every file in `file_paths`, always in the order the files were given, so the merge of the results
+    doesn't depend on the number of jobs or on which worker finishes first.
+
+    Args:
+        file_paths (Iterable[str]): py files to scan. It's consumed lazily, chunk by chunk.
+        jobs (int, optional): number of workers. Defaults to 1 (scans in the current thread). 0 or None uses one worker per cpu.
+        executor (str, optional): 'serial', 'thread' (better for slow/network filesystems) or 'process' (better for cpu bound parsing). Defaults to 'thread'.
+        chunk_size (int, optional): number of files sent to a worker at once. Defaults to 64.
+        cache (ScanCache, optional): cache of previous scans. Only files that are not in it (or changed) are scanned. Defaults to None.
+        header_only (bool, optional): only reads each file up to its first top level def/class, see `read_source`. Defaults to False.
+        profiler (Profiler, optional): gets the size, read and extraction seconds and imports of each scanned file. Defaults to None.
+    """
+    if cache is not None:
+        yield from _scan_files_cached(file_paths, cache, jobs=jobs, executor=executor, chunk_size=chunk_size, header_only=header_only, profiler=profiler)
+        return
+    if profiler is not None:
+        yield from _profiled(_scan_files(file_paths, jobs, executor, chunk_size, header_only, True), profiler)
+        return
+    yield from _scan_files(file_paths, jobs, executor, chunk_size, header_only, False)
+
+def _scan_files(file_paths:Iterable[str], jobs:int, executor:str, chunk_size:int, header_only:bool, timed:bool) -> Iterator[tuple[str, object]]:
+    if executor not in EXECUTORS:
+        raise ValueError(f"executor {executor} is not valid! Use one of {', '.join(EXECUTORS)}")
+    if not jobs:
+        jobs = cpu_count() or 1
+    if jobs < 0:
+        raise ValueError(f"jobs must be a positive number, got {jobs}!")
+    if executor == 'serial' or jobs == 1:
+        scan = _scan_file_timed if timed else scan_file
+        for file_path in file_paths:
+            yield file_path, scan(file_path, header_only)
+        return
+    pool_class = ThreadPoolExecutor if executor == 'thread' else ProcessPoolExecutor
+    with pool_class(max_workers=jobs) as pool:
+        pending = deque()
+        for chunk in _chunks(file_paths, chunk_size):
+            pending.append((chunk, pool.submit(_scan_chunk, chunk, header_only, timed)))
+            if len(pending) > jobs * 2:
+                chunk, future = pending.popleft()
+                yield from zip(chunk, future.result())
+        while pending:
+            chunk, future = pending.popleft()
+            yield from zip(chunk, future.result())
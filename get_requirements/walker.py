@@ -0,0 +1,140 @@
+from fnmatch import fnmatchcase
+from os import scandir, sep
+from os.path import isdir, isfile, islink, join, exists, relpath
+from typing import Iterator, TYPE_CHECKING
+if TYPE_CHECKING:
+    from .graph import ImportGraph
+
+DEFAULT_EXCLUDES = (
+    '__pycache__', 'venv', 'node_modules', 'site-packages', 'build', 'dist', '*.egg-info'
+)
+
+class GitIgnore:
+    "simplified .gitignore matcher: supports comments, negation (!), directory only patterns (trailing /) and anchored patterns (with /)"
+    def __init__(self):
+        self.rules:list[tuple[str, str, bool, bool, bool]] = []
+
+    def add_file(self, gitignore_path:str, base:str):
+        "adds the rules of `gitignore_path`, relative to `base` (the folder of the .gitignore relative to the walked folder)"
+        with open(gitignore_path, encoding='utf-8', errors='replace') as f:
+            lines = f.read().splitlines()
+        for line in lines:
+            line = line.rstrip()
+            if not line or line.startswith('#'):
+                continue
+            negate = line.startswith('!')
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith('/')
+            anchored = '/' in line.rstrip('/')
+            line = line.strip('/')
+            if line:
+                self.rules.append((base, line, negate, dir_only, anchored))
+
+    def copy(self) -> 'GitIgnore':
+        gi = GitIgnore()
+        gi.rules = list(self.rules)
+        return gi
+
+    def is_ignored(self, rel_path:str, name:str, is_dir:bool) -> bool:
+        "returns True if `rel_path` (posix path relative to the walked folder) is ignored. The last rule that matches wins"
+        ignored = False
+        for base, pattern, negate, dir_only, anchored in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if base:
+                if not rel_path.startswith(base + '/'):
+                    continue
+                path = rel_path[len(base) + 1:]
+            else:
+                path = rel_path
+            if not anchored:
+                path = name
+            if fnmatchcase(path, pattern) or (pattern.startswith('**/') and fnmatchcase(path, pattern[3:])):
+                ignored = not negate
+        return ignored
+
+def walk_py_files(folder_path:str, excludes:list[str] = None, use_default_excludes:bool = True, use_gitignore:bool = True, folders:list[str] = None, graph:'ImportGraph' = None) -> Iterator[str]:
+    """
+    Yields the py files inside `folder_path` lazily, in a stable (sorted, depth first) order, with a single `os.scandir` per folder.
+
+    Excluded folders are pruned before being listed. Hidden files and folders (starting with '.'), virtualenvs (folders with a
+    pyvenv.cfg) and symlinked folders are always skipped.
+
+    Args:
+        folder_path (str): folder to walk. If it's not a folder, nothing is yielded.
+        excludes (list[str], optional): glob patterns matched against the name and the path (relative to folder_path, with /) of files and folders to skip. Defaults to None.
+        use_default_excludes (bool, optional): also skips DEFAULT_EXCLUDES (__pycache__, venv, node_modules, build, dist, ...). Defaults to True.
+        use_gitignore (bool, optional): also skips what's ignored by the .gitignore files found in the walked folders. Defaults to True.
+        folders (list[str], optional): if given, the path of each walked folder (folder_path included) is appended to it. Defaults to None.
+        graph (ImportGraph, optional): if given, each yielded py file is added to its local modules (see `ImportGraph.add_module`). Defaults to None.
+    """
+    if not isdir(folder_path):
+        return
+    patterns = list(excludes or [])
+    if use_default_excludes:
+        patterns += DEFAULT_EXCLUDES
+    yield from _walk(folder_path, '', patterns, GitIgnore() if use_gitignore else None, folders, graph)
+
+def is_walked(folder_path:str, path:str, excludes:list[str] = None, use_default_excludes:bool = True, use_gitignore:bool = True) -> bool:
+    """
+    returns True if `path` is a py file or a folder that `walk_py_files(folder_path, ...)` goes through, checking only the folders between
+    them (and their .gitignore files), so a single changed file can be checked without walking folder_path again
+    """
+    rel = relpath(path, folder_path)
+    if rel == '.':
+        return isdir(path)
+    if rel.startswith('..') or not (isdir(path) or (path.endswith('.py') and isfile(path))):
+        return False
+    patterns = list(excludes or [])
+    if use_default_excludes:
+        patterns += DEFAULT_EXCLUDES
+    gitignore = GitIgnore() if use_gitignore else None
+    folder, rel_folder = folder_path, ''
+    for name in rel.split(sep):
+        if rel_folder and exists(join(folder, 'pyvenv.cfg')):
+            return False
+        if gitignore is not None and exists(join(folder, '.gitignore')):
+            gitignore = gitignore.copy()
+            gitignore.add_file(join(folder, '.gitignore'), rel_folder)
+        folder = join(folder, name)
+        rel_path = f'{rel_folder}/{name}' if rel_folder else name
+        is_dir = isdir(folder)
+        if name.startswith('.') or (is_dir and islink(folder)):
+            return False
+        if _is_excluded(rel_path, name, patterns) or (gitignore is not None and gitignore.is_ignored(rel_path, name, is_dir)):
+            return False
+        rel_folder = rel_path
+    return not exists(join(path, 'pyvenv.cfg'))
+
+def _is_excluded(rel_path:str, name:str, patterns:list[str]) -> bool:
+    return any(fnmatchcase(name, p) or fnmatchcase(rel_path, p) for p in patterns)
+
+def _walk(folder:str, rel_folder:str, patterns:list[str], gitignore:GitIgnore|None, folders:list[str]|None, graph:'ImportGraph|None') -> Iterator[str]:
+    try:
+        with scandir(folder) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except OSError:
+        return
+    if rel_folder and any(e.name == 'pyvenv.cfg' for e in entries):
+        return
+    if folders is not None:
+        folders.append(folder)
+    if gitignore is not None and any(e.name == '.gitignore' for e in entries):
+        gitignore = gitignore.copy()
+        gitignore.add_file(join(folder, '.gitignore'), rel_folder)
+    for entry in entries:
+        name = entry.name
+        if name.startswith('.'):
+            continue
+        rel_path = f'{rel_folder}/{name}' if rel_folder else name
+        if entry.is_dir(follow_symlinks=False):
+            if _is_excluded(rel_path, name, patterns) or (gitignore is not None and gitignore.is_ignored(rel_path, name, True)):
+                continue
+            yield from _walk(entry.path, rel_path, patterns, gitignore, folders, graph)
+        elif name.endswith('.py') and entry.is_file():
+            if _is_excluded(rel_path, name, patterns) or (gitignore is not None and gitignore.is_ignored(rel_path, name, False)):
+                continue
+            if graph is not None:
+                graph.add_module(entry.path)
+            yield entry.path
@@ -0,0 +1,281 @@
+from ctypes import CDLL
+from ctypes.util import find_library
+from os import read, close, stat, sep
+from os.path import join, dirname, isdir, abspath
+from select import select
+from struct import unpack_from, calcsize
+from sys import platform
+from time import sleep, monotonic
+from cli_pprinter import CLIPPrinter
+from file_handler import FileHandler
+from .get_standard_python_libraries import get_standard_python_libraries
+from .scanner import scan_files
+from .walker import walk_py_files, is_walked
+from .imports import get_top_level_modules
+from .distributions import get_distribution_resolver
+from .policy import Policy, PolicyError, load_policy, decide
+from .index import ModuleIndex
+from .graph import ImportGraph
+from .report import render_report
+from .run import PackagesInfo, _load_requirements, _packages_info, _get_decisions, _apply_decisions
+
+DEFAULT_DEBOUNCE = 0.3
+DEFAULT_POLL_INTERVAL = 1.0
+IN_MODIFY = 0x2
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = 'iIII'
+EVENT_HEADER_SIZE = calcsize(EVENT_HEADER)
+
+class PollingWatcher:
+    "detects changed py files (and `extra_paths`, e.g. the requirements files) by comparing their mtime and size every `interval` seconds"
+    def __init__(self, folder_path:str, extra_paths:list[str] = (), interval:float = DEFAULT_POLL_INTERVAL, **walk_kwargs):
+        self.folder_path = folder_path
+        self.extra_paths = list(extra_paths)
+        self.interval = interval
+        self.walk_kwargs = walk_kwargs
+        self.snapshot = self._snapshot()
+
+    def _snapshot(self) -> dict[str, tuple[int, int]]:
+        snapshot = {}
+        for path in [*walk_py_files(self.folder_path, **self.walk_kwargs), *self.extra_paths]:
+            try:
+                st = stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def wait(self, timeout:float = None) -> set[str]:
+        "returns the paths added, changed or removed since the last call, waiting up to `timeout` seconds (forever if None) for them"
+        deadline = None if timeout is None else monotonic() + timeout
+        while True:
+            sleep(self.interval if deadline is None else max(min(self.interval, deadline - monotonic()), 0))
+            snapshot = self._snapshot()
+            changed = {p for p in snapshot.keys() | self.snapshot.keys() if snapshot.get(p) != self.snapshot.get(p)}
+            self.snapshot = snapshot
+            if changed or (deadline is not None and monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+class InotifyWatcher:
+    "detects changes with linux inotify (through ctypes), watching every walked folder of `folder_path` and the folders of `extra_paths`"
+    def __init__(self, folder_path:str, extra_paths:list[str] = (), **walk_kwargs):
+        self.folder_path = folder_path
+        self.walk_kwargs = walk_kwargs
+        self.libc = CDLL(find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError('inotify is not available!')
+        self.folders:dict[int, str] = {}
+        self._add_folders(folder_path)
+        for path in extra_paths:
+            if dirname(path) not in self.folders.values():
+                self._add_watch(dirname(path))
+
+    def _add_watch(self, folder:str):
+        wd = self.libc.inotify_add_watch(self.fd, folder.encode(), WATCH_MASK)
+        if wd >= 0:
+            self.folders[wd] = folder
+
+    def _add_folders(self, folder:str):
+        "watches `folder` and its walked subfolders"
+        folders = []
+        for _ in walk_py_files(folder, folders=folders, **self.walk_kwargs):
+            pass
+        for f in folders:
+            if is_walked(self.folder_path, f, **self.walk_kwargs):
+                self._add_watch(f)
+
+    def wait(self, timeout:float = None) -> set[str]:
+        """
+        returns the paths added, changed or removed since the last call, waiting up to `timeout` seconds (forever if None) for them.
+        If events were lost (the inotify queue overflowed), folder_path itself is returned, meaning everything must be checked again.
+        """
+        if not select([self.fd], [], [], timeout)[0]:
+            return set()
+        changed = set()
+        while True:
+            try:
+                buffer = read(self.fd, 1 << 16)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _, length = unpack_from(EVENT_HEADER, buffer, offset)
+                name = buffer[offset + EVENT_HEADER_SIZE:offset + EVENT_HEADER_SIZE + length].rstrip(b'\0').decode(errors='surrogateescape')
+                offset += EVENT_HEADER_SIZE + length
+                if mask & IN_Q_OVERFLOW:
+                    changed.add(self.folder_path)
+                    continue
+                if mask & IN_IGNORED:
+                    self.folders.pop(wd, None)
+                    continue
+                folder = self.folders.get(wd)
+                if folder is None:
+                    continue
+                path = join(folder, name) if name else folder
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and is_walked(self.folder_path, path, **self.walk_kwargs):
+                    self._add_folders(path)
+                changed.add(path)
+        return changed
+
+    def close(self):
+        close(self.fd)
+
+def make_watcher(folder_path:str, extra_paths:list[str] = (), use_polling:bool = False, poll_interval:float = DEFAULT_POLL_INTERVAL, **walk_kwargs) -> InotifyWatcher|PollingWatcher:
+    "returns an InotifyWatcher on linux (unless `use_polling`) or, if inotify can't be used, a PollingWatcher"
+    if not use_polling and platform.startswith('linux'):
+        try:
+            return InotifyWatcher(folder_path, extra_paths, **walk_kwargs)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(folder_path, extra_paths, interval=poll_interval, **walk_kwargs)
+
+class WatchSession:
+    """
+    Keeps the modules imported in each py file of `folder_path` in memory (in a ModuleIndex, and the local ones in an ImportGraph) and
+    updates them only for the files that changed, so the requirements diff can be emitted again right after an edit.
+    """
+    def __init__(self, folder_path:str, requirements_file_path:str, requirements_dev_file_path:str, jobs:int = 1, executor:str = 'thread', python_version:str = None, header_only:bool = False, resolve_distributions:bool = True, **walk_kwargs):
+        self.folder_path = folder_path
+        self.requirements_file_path = requirements_file_path
+        self.requirements_dev_file_path = requirements_dev_file_path
+        self.scan_kwargs = {'jobs': jobs, 'executor': executor, 'header_only': header_only}
+        self.walk_kwargs = walk_kwargs
+        self.standard_modules = get_standard_python_libraries(python_version)
+        self.resolver = get_distribution_resolver() if resolve_distributions else None
+        self.index = ModuleIndex()
+        self.graph = ImportGraph(folder_path)
+        self.last_emitted = None
+        self.load_requirements()
+
+    def load_requirements(self):
+        "reads the requirements files again"
+        self.requirements_packages = _load_requirements(self.requirements_file_path)
+        self.requirements_dev_packages = _load_requirements(self.requirements_dev_file_path)
+
+    @property
+    def pi(self) -> PackagesInfo:
+        "the packages of the files as they are now"
+        return _packages_info(self.index, self.requirements_packages, self.requirements_dev_packages, self.standard_modules)
+
+    def update(self, paths:set[str]) -> int:
+        """
+        updates the packages with the changed `paths` (py files, folders or requirements files; removed ones included) and returns the
+        number of py files scanned or removed. folder_path itself means everything is checked again.
+        """
+        to_scan = {}
+        removed = []
+        for path in paths:
+            if path in (self.requirements_file_path, self.requirements_dev_file_path):
+                self.load_requirements()
+            elif path == self.folder_path:
+                self.graph = ImportGraph(self.folder_path)
+                to_scan.update(dict.fromkeys(walk_py_files(path, graph=self.graph, **self.walk_kwargs)))
+                for file in [f for f in self.index.iter_files() if f not in to_scan]:
+                    self.index.remove_file(file)
+                    removed.append(file)
+            elif isdir(path):
+                to_scan.update(dict.fromkeys(f for f in walk_py_files(path, **self.walk_kwargs) if is_walked(self.folder_path, f, **self.walk_kwargs)))
+            elif path.endswith('.py') and is_walked(self.folder_path, path, **self.walk_kwargs):
+                to_scan[path] = None
+            else:
+                for file in [f for f in self.index.iter_files() if f == path or f.startswith(path + sep)]:
+                    self.index.remove_file(file)
+                    self.graph.remove_file(file)
+                    self.graph.remove_module(file)
+                    removed.append(file)
+        added = [f for f in to_scan if self.graph.add_module(f)]
+        # the imports of the modules added or removed may be local now, or not anymore
+        for file in added + removed:
+            to_scan.update(dict.fromkeys(f for f in self.graph.affected_by(file) if f in self.index))
+        for file, records in scan_files(to_scan, **self.scan_kwargs):
+            records = self.graph.add_file(file, records)
+            self.index.add_file(file, self.resolver.requirement_names(records, self.standard_modules) if self.resolver else get_top_level_modules(records))
+        return len(to_scan) + len(removed)
+
+    def emit(self, policy:Policy|dict|str = None, write_requirements_file:bool = False) -> bool:
+        """
+        decides (without asking, see `load_policy`) what to add to or remove from the requirements files and prints the report if it's
+        different from the last one. Returns True if it was printed. The requirements files are only written if something changed
+        """
+        pi = self.pi
+        try:
+            pi.decisions = decide(_get_decisions(pi), load_policy(self.folder_path, policy, batch=True))
+        except PolicyError as e:
+            if self.last_emitted != str(e):
+                self.last_emitted = str(e)
+                CLIPPrinter.red(str(e))
+                return True
+            return False
+        emitted = [(d.package, d.category, d.action) for d in pi.decisions]
+        if emitted == self.last_emitted:
+            return False
+        self.last_emitted = emitted
+        _apply_decisions(pi)
+        if write_requirements_file and pi.new_requirements_packages != pi.requirements_packages:
+            FileHandler.write({self.requirements_file_path: '\n'.join(sorted(pi.new_requirements_packages))})
+        if write_requirements_file and pi.new_requirements_dev_packages != pi.requirements_dev_packages:
+            FileHandler.write({self.requirements_dev_file_path: '\n'.join(sorted(pi.new_requirements_dev_packages))})
+        CLIPPrinter.green(render_report(pi, self.folder_path))
+        return True
+
+def watch(folder_path:str = None, requirements_file_path:str = None, requirements_dev_file_path:str = None, write_requirements_file:bool = False, policy:Policy|dict|str = None, debounce:float = DEFAULT_DEBOUNCE, use_polling:bool = False, poll_interval:float = DEFAULT_POLL_INTERVAL, max_updates:int = None, jobs:int = 1, executor:str = 'thread', python_version:str = None, header_only:bool = False, resolve_distributions:bool = True, excludes:list[str] = None, use_default_excludes:bool = True, use_gitignore:bool = True) -> PackagesInfo:
+    """
+    Scans `folder_path` once and then keeps watching it (inotify on linux, polling otherwise), scanning again only the py files that
+    changed and printing the requirements report whenever it changes. Changes are debounced: they are handled once no other change
+    happens for `debounce` seconds, so saving many files at once gives a single report. It never asks the user (see `load_policy`).
+
+    Args:
+        folder_path (str, optional): folder to watch. Defaults to None (current directory).
+        requirements_file_path (str, optional): path to the requirements.txt file. Defaults to None (folder_path/requirements.txt).
+        requirements_dev_file_path (str, optional): path to the requirements_dev.txt file. Defaults to None (folder_path/requirements_dev.txt).
+        write_requirements_file (bool, optional): writes the requirements files when the policy changes them. Defaults to False.
+        policy (Policy|dict|str, optional): see `get_requirements`. Categories without a policy are kept as they are. Defaults to None.
+        debounce (float, optional): seconds without changes before handling them. Defaults to 0.3.
+        use_polling (bool, optional): polls the files even if inotify is available. Defaults to False.
+        poll_interval (float, optional): seconds between polls. Defaults to 1.0.
+        max_updates (int, optional): stops after handling this many batches of changes. Defaults to None (until interrupted with ctrl+c).
+        jobs, executor, python_version, header_only, resolve_distributions, excludes, use_default_excludes, use_gitignore: see `get_requirements`.
+
+    Returns:
+        PackagesInfo: the packages when it stopped.
+    """
+    folder_path = abspath(folder_path or '.')
+    requirements_file_path = abspath(requirements_file_path or join(folder_path, 'requirements.txt'))
+    requirements_dev_file_path = abspath(requirements_dev_file_path or join(folder_path, 'requirements_dev.txt'))
+    walk_kwargs = {'excludes': excludes, 'use_default_excludes': use_default_excludes, 'use_gitignore': use_gitignore}
+    session = WatchSession(folder_path, requirements_file_path, requirements_dev_file_path, jobs=jobs, executor=executor, python_version=python_version, header_only=header_only, resolve_distributions=resolve_distributions, **walk_kwargs)
+    watcher = make_watcher(folder_path, [requirements_file_path, requirements_dev_file_path], use_polling=use_polling, poll_interval=poll_interval, **walk_kwargs)
+    CLIPPrinter.white(f'Watching {folder_path} ({type(watcher).__name__}), ctrl+c to stop')
+    session.update({folder_path})
+    session.emit(policy, write_requirements_file)
+    updates = 0
+    try:
+        while max_updates is None or updates < max_updates:
+            paths = watcher.wait()
+            while more := watcher.wait(debounce):
+                paths |= more
+            count = session.update(paths)
+            if count:
+                CLIPPrinter.white(f'{count} py files updated')
+            session.emit(policy, write_requirements_file)
+            updates += 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    return session.pi
@@ -17,6 +17,6 @@ setup(
         "Programming Language :: Python :: 3.12"
     ],
     entry_points={ "console_scripts": [
-        "get_requirements=get_requirements.run:cli"
+        "get_requirements=get_requirements.cli:main"
     ]}
 )
@@ -0,0 +1,77 @@
+from get_requirements.batch import get_requirements_for_projects, load_manifest, write_projects_report, write_project_jsonl
+from get_requirements.cache import open_scan_cache
+from get_requirements.profiling import Profiler
+
+from json import load, loads
+from os.path import dirname, join
+
+mocks_folder = join(dirname(__file__), 'mocks')
+folder_paths = [join(mocks_folder, 'test1'), join(mocks_folder, 'test2')]
+
+def test_get_requirements_for_projects(tmp_path):
+    cache_path = join(tmp_path, 'scan_cache.json')
+    results = get_requirements_for_projects(
+        folder_paths,
+        project_jobs=2,
+        use_cache=True,
+        cache_path=cache_path,
+        policy='missing=add',
+        write_requirements_file=False,
+        write_requirements_generated=False
+    )
+    assert list(results) == folder_paths
+    assert results[folder_paths[0]].result.new_requirements_packages == set()
+    assert results[folder_paths[1]].result.new_requirements_packages == {'custom_module', 'oxe', 'typing', 'fake_module_2', 'fake_module_3'}
+    assert len(open_scan_cache(cache_path).entries) == 6
+    results = get_requirements_for_projects(folder_paths, policy='missing=fail', write_requirements_file=False, write_requirements_generated=False)
+    assert results[folder_paths[0]].error is None
+    assert 'fake_module_2' in results[folder_paths[1]].error
+    report_path = join(tmp_path, 'report.json')
+    write_projects_report(results, report_path)
+    with open(report_path) as f:
+        report = load(f)
+    assert list(report) == folder_paths
+    assert report[folder_paths[1]]['result'] is None
+
+def test_get_requirements_for_projects_profiler(tmp_path):
+    cache_path = join(tmp_path, 'scan_cache.json')
+    for hits in (0, 6):
+        profiler = Profiler()
+        get_requirements_for_projects(
+            folder_paths,
+            use_cache=True,
+            cache_path=cache_path,
+            policy='missing=add',
+            write_requirements_file=False,
+            write_requirements_generated=False,
+            report_format=None,
+            quiet=True,
+            profiler=profiler
+        )
+        assert profiler.counters['discovered'] == 6
+        assert profiler.counters['modules'] == 7
+        assert (profiler.counters['cache_hits'], profiler.counters['cache_misses']) == (hits, 6 - hits)
+
+def test_load_manifest(tmp_path):
+    manifest_path = join(tmp_path, 'projects.txt')
+    with open(manifest_path, 'w') as f:
+        f.write(f'# services\n\nservice_a\n{mocks_folder}\n')
+    assert load_manifest(manifest_path) == [join(tmp_path, 'service_a'), mocks_folder]
+
+def test_stream_projects_jsonl(tmp_path):
+    jsonl_path = join(tmp_path, 'report.jsonl')
+    with open(jsonl_path, 'w') as f:
+        get_requirements_for_projects(
+            folder_paths + [join(mocks_folder, 'missing')],
+            policy='missing=add',
+            on_result=lambda project: write_project_jsonl(project, f),
+            write_requirements_file=False,
+            write_requirements_generated=False,
+            report_format=None
+        )
+    with open(jsonl_path) as f:
+        lines = [loads(line) for line in f]
+    assert sorted(line['package'] for line in lines if line['folder_path'] == folder_paths[1]) == [
+        'cli_pprinter', 'custom_module', 'fake_module_2', 'fake_module_3', 'file_handler', 'json', 'oxe', 'typing'
+    ]
+    assert [line['error'] for line in lines if line['folder_path'] == join(mocks_folder, 'missing')] == [f"folder_path {join(mocks_folder, 'missing')} doesn't exist!"]
@@ -0,0 +1,69 @@
+from get_requirements.cache import ScanCache, make_fingerprint
+from get_requirements.scanner import scan_files
+from get_requirements.imports import ImportRecord
+
+from os import utime, stat, makedirs, remove
+from os.path import join
+
+def make_files(folder, count):
+    file_paths = []
+    for i in range(count):
+        file_path = join(folder, f'module_{i}.py')
+        with open(file_path, 'w') as f:
+            f.write(f'import package_{i}\n')
+        file_paths.append(file_path)
+    return file_paths
+
+def test_scan_cache(tmp_path):
+    cache_path = join(tmp_path, '.get_requirements_cache')
+    file_paths = make_files(tmp_path, 5)
+    expected = [(f, [ImportRecord(f'package_{i}', line=1)]) for i, f in enumerate(file_paths)]
+    cache = ScanCache(cache_path, fingerprint='1')
+    assert list(scan_files(file_paths, cache=cache)) == expected
+    assert (cache.hits, cache.misses) == (0, 5)
+    cache.save()
+    with open(file_paths[2], 'w') as f:
+        f.write('import changed_package\n')
+    utime(file_paths[2], ns=(0, 0))
+    expected[2] = (file_paths[2], [ImportRecord('changed_package', line=1)])
+    cache = ScanCache(cache_path, fingerprint='1')
+    assert list(scan_files(file_paths, jobs=2, chunk_size=1, cache=cache)) == expected
+    assert (cache.hits, cache.misses) == (4, 1)
+    cache.save()
+    cache = ScanCache(cache_path, fingerprint='1')
+    assert list(scan_files(file_paths[:3], cache=cache)) == expected[:3]
+    assert (cache.hits, cache.misses) == (3, 0)
+    cache.save()
+    assert sorted(ScanCache(cache_path, fingerprint='1').entries) == sorted(file_paths[:3])
+    assert ScanCache(cache_path, fingerprint='2').entries == {}
+
+def test_scan_cache_hash(tmp_path):
+    cache_path = join(tmp_path, '.get_requirements_cache')
+    file_paths = make_files(tmp_path, 2)
+    cache = ScanCache(cache_path, use_hash=True)
+    list(scan_files(file_paths, cache=cache))
+    cache.save()
+    st = stat(file_paths[0])
+    utime(file_paths[0], ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    cache = ScanCache(cache_path, use_hash=True)
+    assert list(scan_files(file_paths, cache=cache)) == [(f, [ImportRecord(f'package_{i}', line=1)]) for i, f in enumerate(file_paths)]
+    assert (cache.hits, cache.misses) == (2, 0)
+
+def test_make_fingerprint():
+    assert make_fingerprint('1', {'os', 'sys'}) == make_fingerprint('1', ['sys', 'os'])
+    assert make_fingerprint('1', {'os', 'sys'}) != make_fingerprint('2', {'os', 'sys'})
+
+def test_scan_cache_save_roots(tmp_path):
+    cache_path = join(tmp_path, 'scan_cache.json')
+    file_paths = {}
+    for project in ('a', 'b', 'c'):
+        makedirs(join(tmp_path, project))
+        file_paths[project] = make_files(join(tmp_path, project), 2)
+    cache = ScanCache(cache_path)
+    list(scan_files(file_paths['a'] + file_paths['b'], cache=cache))
+    cache.save(roots=[join(tmp_path, 'a'), join(tmp_path, 'b')])
+    remove(file_paths['b'][0])
+    cache = ScanCache(cache_path)
+    list(scan_files(file_paths['c'] + file_paths['a'][:1], cache=cache))
+    cache.save(roots=[join(tmp_path, 'c'), join(tmp_path, 'a')])
+    assert sorted(ScanCache(cache_path).entries) == sorted(file_paths['a'][:1] + file_paths['b'][1:] + file_paths['c'])
@@ -0,0 +1,52 @@
+from get_requirements.cli import check, main
+
+from os.path import dirname, join
+from subprocess import run
+from unittest.mock import patch
+import sys
+import pytest
+
+mocks_folder = join(dirname(__file__), 'mocks')
+
+def test_cli_import_is_light():
+    code = 'import sys, get_requirements, get_requirements.cli; print(sorted(m for m in ("pydantic", "cli_pprinter", "file_handler") if m in sys.modules))'
+    result = run([sys.executable, '-c', code], capture_output=True, text=True, cwd=dirname(dirname(__file__)))
+    assert result.stdout.strip() == '[]'
+
+def test_check():
+    assert check(join(mocks_folder, 'test2'), resolve_distributions=False) == [
+        ('oxe', 'unused', 'requirements.txt'),
+        ('typing', 'standard', 'requirements.txt'),
+        ('fake_module_2', 'missing', 'requirements.txt'),
+        ('fake_module_3', 'missing', 'requirements.txt'),
+        ('cli_pprinter', 'dev_missing', 'requirements_dev.txt'),
+        ('custom_module', 'dev_missing', 'requirements_dev.txt'),
+        ('fake_module_3', 'dev_missing', 'requirements_dev.txt'),
+        ('file_handler', 'dev_missing', 'requirements_dev.txt')
+    ]
+    with pytest.raises(ValueError):
+        check(join(mocks_folder, 'missing'))
+
+def test_main_check(tmp_path, capsys):
+    with open(join(tmp_path, 'main.py'), 'w') as f:
+        f.write('import os\nimport numpy\nimport custom_module\n')
+    with open(join(tmp_path, 'custom_module.py'), 'w') as f:
+        f.write('')
+    with open(join(tmp_path, 'main_test.py'), 'w') as f:
+        f.write('import pytest\n')
+    with open(join(tmp_path, 'requirements.txt'), 'w') as f:
+        f.write('numpy')
+    with patch.object(sys, 'argv', ['get_requirements', '--check', '-f', str(tmp_path)]):
+        with pytest.raises(SystemExit) as e:
+            main()
+    assert e.value.code == 1
+    assert capsys.readouterr().out.splitlines() == [
+        'package numpy: imported in py files, but not in requirements_dev.txt',
+        'package pytest: imported in py files, but not in requirements_dev.txt'
+    ]
+    with open(join(tmp_path, 'requirements_dev.txt'), 'w') as f:
+        f.write('numpy\npytest')
+    with patch.object(sys, 'argv', ['get_requirements', '--check', '-f', str(tmp_path), '-q']):
+        with pytest.raises(SystemExit) as e:
+            main()
+    assert e.value.code == 0
@@ -0,0 +1,38 @@
+from get_requirements.distributions import DistributionResolver, build_distribution_index, get_distribution_resolver, normalize_name, _module_prefixes
+from get_requirements.imports import extract_imports
+
+from os.path import join, exists
+
+def test_normalize_name():
+    assert normalize_name('Foo_Bar.baz') == 'foo-bar-baz'
+    assert normalize_name('cli_pprinter') == normalize_name('cli-pprinter')
+
+def test_module_prefixes():
+    assert _module_prefixes(('google', 'cloud', 'storage', 'blob.py'), 'google') == ['google.cloud', 'google.cloud.storage']
+    assert _module_prefixes(('google', 'protobuf', '__init__.py'), 'google') == ['google.protobuf']
+    assert _module_prefixes(('google', 'protobuf.py'), 'google') == ['google.protobuf']
+    assert _module_prefixes(('other', 'protobuf.py'), 'google') == []
+
+def test_resolve():
+    resolver = DistributionResolver({'google.protobuf': 'protobuf', 'cli_pprinter': 'cli-pprinter', 'yaml': 'PyYAML'})
+    assert resolver.resolve('yaml') == 'pyyaml'
+    assert resolver.resolve('sklearn.linear_model') == 'scikit-learn'
+    assert resolver.resolve('google.protobuf.message') == 'protobuf'
+    assert resolver.resolve('google.cloud.storage') == 'google-cloud-storage'
+    assert resolver.resolve('cli_pprinter') is None
+    assert resolver.resolve('unknown_package') is None
+
+def test_requirement_names():
+    resolver = DistributionResolver({})
+    records = extract_imports(b'import os\nimport yaml\nfrom google import protobuf\nfrom google.cloud import storage\nfrom . import local\nimport numpy.linalg\nfrom PIL import Image\n')
+    assert resolver.requirement_names(records, frozenset({'os'})) == ['os', 'pyyaml', 'protobuf', 'google-cloud-storage', 'numpy', 'pillow']
+
+def test_installed_index(tmp_path):
+    index = build_distribution_index()
+    assert index['pytest'] == 'pytest'
+    index_path = join(tmp_path, 'distributions.json')
+    resolver = get_distribution_resolver(index_path)
+    assert exists(index_path)
+    assert resolver.resolve('pytest') is None
+    get_distribution_resolver.cache_clear()
+    assert get_distribution_resolver(index_path).index == resolver.index
@@ -1,5 +1,26 @@
-from get_requirements.get_standard_python_libraries import get_standard_python_libraries
+from get_requirements.get_standard_python_libraries import get_standard_python_libraries, save_standard_python_libraries
+
+from json import dump
+from sys import version_info
+from os.path import join
+import pytest
 
 def test_all():
     standard_libraries = get_standard_python_libraries()
-    assert not {'re', 'os', 'asyncio', 'subprocess'} - set(standard_libraries)
\ No newline at end of file
+    assert not {'re', 'os', 'asyncio', 'subprocess'} - set(standard_libraries)
+
+def test_index():
+    standard_libraries = get_standard_python_libraries()
+    assert isinstance(standard_libraries, frozenset)
+    assert 'sys' in standard_libraries
+    assert 'pydantic' not in standard_libraries
+    assert get_standard_python_libraries() is standard_libraries
+
+def test_other_python_version(tmp_path):
+    index_dir = str(tmp_path)
+    with pytest.raises(ValueError):
+        get_standard_python_libraries('2.7', index_dir)
+    assert save_standard_python_libraries(index_dir) == join(index_dir, f'stdlib_{version_info.major}.{version_info.minor}.json')
+    with open(join(index_dir, 'stdlib_2.8.json'), 'w') as f:
+        dump(['os', 'imp'], f)
+    assert get_standard_python_libraries('2.8', index_dir) == {'os', 'imp'}
@@ -0,0 +1,108 @@
+from get_requirements.graph import ImportGraph
+from get_requirements.imports import ImportRecord, extract_imports
+from get_requirements.scanner import scan_files
+from get_requirements.walker import walk_py_files
+
+from os import makedirs
+from os.path import dirname, join
+
+FILES = {
+    'main.py': 'import app\nimport custom_module\n',
+    'custom_module.py': 'import requests\n',
+    join('app', '__init__.py'): 'from .models import Model\nimport yaml\n',
+    join('app', 'models.py'): 'import numpy\nfrom app.utils import helper\n',
+    join('app', 'utils.py'): 'import os\n',
+    join('tests', 'helpers.py'): '',
+    join('tests', 'test_app.py'): 'from app import models\nimport helpers\nimport pytest\n',
+    join('src', 'lib', '__init__.py'): 'import attr\n',
+    join('scripts', 'run.py'): 'import lib.core\nfrom .. import custom_module\n'
+}
+
+def build(folder, graph_folder=None):
+    for file, text in FILES.items():
+        makedirs(dirname(join(folder, file)), exist_ok=True)
+        with open(join(folder, file), 'w') as f:
+            f.write(text)
+    graph = ImportGraph(graph_folder or folder)
+    external = {file[len(folder) + 1:]:[r.module for r in graph.add_file(file, records)] for file, records in scan_files(list(walk_py_files(graph_folder or folder, graph=graph)))}
+    return graph, external
+
+def test_import_graph(tmp_path):
+    folder = str(tmp_path)
+    graph, external = build(folder)
+    assert external == {
+        join('app', '__init__.py'): ['yaml'],
+        join('app', 'models.py'): ['numpy'],
+        join('app', 'utils.py'): ['os'],
+        'custom_module.py': ['requests'],
+        'main.py': [],
+        join('scripts', 'run.py'): [],
+        join('src', 'lib', '__init__.py'): ['attr'],
+        join('tests', 'helpers.py'): [],
+        join('tests', 'test_app.py'): ['pytest']
+    }
+    path = lambda *parts: join(folder, *parts)
+    assert graph.imports[path('main.py')] == (path('app', '__init__.py'), path('custom_module.py'))
+    assert graph.imports[path('app', 'models.py')] == (path('app', '__init__.py'), path('app', 'utils.py'))
+    assert graph.imports[path('tests', 'test_app.py')] == (path('app', '__init__.py'), path('app', 'models.py'), path('tests', 'helpers.py'))
+    assert graph.imports[path('scripts', 'run.py')] == (path('src', 'lib', '__init__.py'), path('custom_module.py'))
+    assert graph.is_local(path('tests', 'test_app.py'), 'helpers') and not graph.is_local(path('main.py'), 'helpers')
+    assert graph.files_pulling_in('numpy') == [path('app', '__init__.py'), path('app', 'models.py'), path('main.py'), path('tests', 'test_app.py')]
+    assert graph.files_pulling_in('requests') == [path('custom_module.py'), path('main.py'), path('scripts', 'run.py')]
+    assert graph.files_pulling_in('pytest') == [path('tests', 'test_app.py')]
+    assert graph.files_pulling_in('missing') == []
+
+def test_import_graph_update(tmp_path):
+    folder = str(tmp_path)
+    graph, _ = build(folder)
+    main, custom_module = join(folder, 'main.py'), join(folder, 'custom_module.py')
+    assert not graph.add_module(custom_module)
+    assert graph.remove_module(custom_module)
+    graph.remove_file(custom_module)
+    assert graph.affected_by(custom_module) == {main, join(folder, 'scripts', 'run.py')}
+    assert [r.module for r in graph.add_file(main, [*scan_files([main])][0][1])] == ['custom_module']
+    assert graph.files_pulling_in('custom_module') == [main]
+    assert graph.files_pulling_in('requests') == []
+    assert graph.remove_module(join(folder, 'tests', 'helpers.py'))
+    assert join(folder, 'tests') in graph.packages
+    assert graph.remove_module(join(folder, 'tests', 'test_app.py'))
+    assert join(folder, 'tests') not in graph.packages and join(folder, 'tests') not in graph.modules
+
+def test_import_graph_trailing_slash(tmp_path):
+    folder = str(tmp_path)
+    graph, external = build(folder, join(folder, ''))
+    assert external['main.py'] == [] and external[join('scripts', 'run.py')] == []
+    assert graph.is_local(join(folder, 'main.py'), 'custom_module')
+    assert graph.files_pulling_in('requests') == [join(folder, 'custom_module.py'), join(folder, 'main.py'), join(folder, 'scripts', 'run.py')]
+
+def test_import_graph_package_modules(tmp_path):
+    folder = str(tmp_path)
+    files = {
+        join('proj', '__init__.py'): 'from .celery import app\n',
+        join('proj', 'celery.py'): 'from celery import Celery\n',
+        join('proj', 'tasks.py'): 'from proj.celery import app\nimport celery\n',
+        join('scripts', 'celery.py'): 'import celery\n'
+    }
+    for file, text in files.items():
+        makedirs(dirname(join(folder, file)), exist_ok=True)
+        with open(join(folder, file), 'w') as f:
+            f.write(text)
+    graph = ImportGraph(folder)
+    external = {file[len(folder) + 1:]:[r.module for r in graph.add_file(file, records)] for file, records in scan_files(list(walk_py_files(folder, graph=graph)))}
+    assert external == {
+        join('proj', '__init__.py'): [],
+        join('proj', 'celery.py'): ['celery'],
+        join('proj', 'tasks.py'): ['celery'],
+        join('scripts', 'celery.py'): ['celery']
+    }
+    assert graph.imports[join(folder, 'proj', 'tasks.py')] == (join(folder, 'proj', '__init__.py'), join(folder, 'proj', 'celery.py'))
+    assert graph.files_pulling_in('celery') == sorted(join(folder, f) for f in files)
+
+def test_import_graph_broken_import(tmp_path):
+    folder = str(tmp_path)
+    graph = ImportGraph(folder)
+    graph.add_module(join(folder, 'main.py'))
+    records = extract_imports(b'from  import x\nimport yaml\ndef broken(:\n')
+    assert records[0] == ImportRecord('', 0, 1, names=('x',))
+    assert graph.add_file(join(folder, 'main.py'), records) == records
+    assert graph.external[join(folder, 'main.py')] == ('yaml',)
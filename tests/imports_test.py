@@ -0,0 +1,82 @@
+from get_requirements import imports
+from get_requirements.imports import extract_imports, get_top_level_modules, records_from_json, ImportRecord
+
+from json import dumps, loads
+
+source = b'''"""
+import not_a_module
+"""
+import os, sys as system
+from a.b import (c,
+    d as e)
+import json; import yaml
+from . import sibling
+from ..pkg.module import name
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    import numpy
+try:
+    import ujson
+except ImportError:
+    import simplejson
+
+def main():
+    import PIL.Image
+    return 1
+
+x = 2
+'''
+
+def test_extract_imports():
+    records = extract_imports(source)
+    assert records == [
+        ImportRecord('os', 0, 4),
+        ImportRecord('sys', 0, 4),
+        ImportRecord('a.b', 0, 5, names=('c', 'd')),
+        ImportRecord('json', 0, 7),
+        ImportRecord('yaml', 0, 7),
+        ImportRecord('', 1, 8, names=('sibling',)),
+        ImportRecord('pkg.module', 2, 9, names=('name',)),
+        ImportRecord('typing', 0, 10, names=('TYPE_CHECKING',)),
+        ImportRecord('numpy', 0, 12, in_type_checking=True),
+        ImportRecord('ujson', 0, 14, in_try=True),
+        ImportRecord('simplejson', 0, 16, in_try=True),
+        ImportRecord('PIL.Image', 0, 19),
+    ]
+    assert get_top_level_modules(records) == ['os', 'sys', 'a', 'json', 'yaml', 'typing', 'numpy', 'ujson', 'simplejson', 'pil']
+    assert records_from_json(loads(dumps(records))) == records
+
+def test_extract_imports_fallback():
+    assert extract_imports(b'import os, re\nfrom .local import (a, b as c)\nfrom x import *\ndef broken(:\n    import json\n') == [
+        ImportRecord('os', 0, 1),
+        ImportRecord('re', 0, 1),
+        ImportRecord('local', 1, 2, names=('a', 'b')),
+        ImportRecord('x', 0, 3, names=('*',)),
+        ImportRecord('json', 0, 5),
+    ]
+
+def test_extract_imports_without_imports():
+    assert extract_imports(b'x = 1\n' * 1000) == []
+    assert extract_imports(b'') == []
+
+def test_extract_imports_with_odd_triple_quotes():
+    assert extract_imports(b'QUOTES = \'"""\'  # """ in a comment\n"""\nimport not_a_module\n"""\nimport os\n') == [ImportRecord('os', 0, 5)]
+
+def test_extract_imports_after_other_statements():
+    assert extract_imports(b'x = 1; import os\n') == [ImportRecord('os', 0, 1)]
+    assert extract_imports(b'try: import ujson\nexcept ImportError: ujson = None\n') == [ImportRecord('ujson', 0, 1, in_try=True)]
+    assert extract_imports(b'if X: import yaml\n') == [ImportRecord('yaml', 0, 1)]
+    assert extract_imports(b'import os\nx = "not an import"  # import nothing\nimportlib.import_module("json")\n') == [ImportRecord('os', 0, 1)]
+
+def test_extract_imports_with_triple_quotes_in_comments():
+    assert extract_imports(b"# '''\nimport a\n# '''\nimport b\n") == [ImportRecord('a', 0, 2), ImportRecord('b', 0, 4)]
+    assert extract_imports(b'x = "\'\'\'"\nimport a\ny = "\'\'\'"\n') == [ImportRecord('a', 0, 2)]
+    assert extract_imports(b'x = """\n""" + y + """\nimport not_a_module\n"""\nimport os\n') == [ImportRecord('os', 0, 5)]
+
+def test_extract_imports_with_backslash_continuation():
+    assert extract_imports(b'from x \\\n    import y\n') == [ImportRecord('x', 0, 1, names=('y',))]
+    assert extract_imports(b'import os, \\\r\n    sys\r\n') == [ImportRecord('os', 0, 1), ImportRecord('sys', 0, 1)]
+
+def test_extract_imports_docstring_mentioning_import(monkeypatch):
+    monkeypatch.setattr(imports, '_extract_imports_ast', None)
+    assert extract_imports(b'"""Core implementation of import.\n\nfrom the cache\n"""\nimport os\n') == [ImportRecord('os', 0, 5)]
@@ -0,0 +1,47 @@
+from get_requirements.index import ModuleIndex, is_test_file, requirements_drift
+
+from os.path import join
+
+def test_is_test_file():
+    assert is_test_file(join('pkg', 'main_test.py'))
+    assert is_test_file(join('pkg', 'test_main.py'))
+    assert is_test_file(join('pkg', 'conftest.py'))
+    assert not is_test_file(join('tests', 'main.py'))
+
+def test_module_index():
+    index = ModuleIndex()
+    assert index.add_file(join('pkg', 'a.py'), ['yaml', 'os', 'yaml']) == 0
+    assert index.add_file(join('pkg', 'a_test.py'), ['yaml', 'pytest']) == 1
+    assert index.add_file(join('pkg', 'b.py'), ['numpy']) == 2
+    assert len(index) == 3 and join('pkg', 'b.py') in index
+    assert index.module_files('yaml') == [join('pkg', 'a.py'), join('pkg', 'a_test.py')]
+    assert list(index.is_test) == [0, 1, 0]
+    assert index.is_on_standard_files('yaml') and not index.is_on_standard_files('pytest')
+    index.remove_file(join('pkg', 'a.py'))
+    assert sorted(index.modules) == ['numpy', 'pytest', 'yaml']
+    assert not index.is_on_standard_files('yaml')
+    assert index.add_file(join('pkg', 'b.py'), ['requests']) == 2
+    assert sorted(index.modules) == ['pytest', 'requests', 'yaml']
+    assert list(index.iter_files()) == [join('pkg', 'a_test.py'), join('pkg', 'b.py')]
+    assert index.module_files('numpy') == []
+    assert index.add_file(join('pkg', 'c.py'), ['yaml']) == 0
+    assert list(index.is_test) == [0, 1, 0]
+    assert index.module_files('yaml') == [join('pkg', 'c.py'), join('pkg', 'a_test.py')]
+    for _ in range(100):
+        index.add_file(join('pkg', 'b.py'), ['requests'])
+        index.remove_file(join('pkg', 'c.py'))
+        index.add_file(join('pkg', 'c.py'), ['yaml'])
+    assert len(index.files) == 3 and len(index.is_test) == 3 and len(index) == 3
+
+def test_requirements_drift():
+    index = ModuleIndex()
+    index.add_file(join('pkg', 'a.py'), ['yaml', 'os'])
+    index.add_file(join('pkg', 'a_test.py'), ['pytest'])
+    assert index.imported() == {'yaml': True, 'os': True, 'pytest': False}
+    assert requirements_drift(index.imported(), {'os', 'pytest', 'oxe'}, {'yaml'}, frozenset({'os'})) == [
+        ('os', 'standard', 'requirements.txt'),
+        ('oxe', 'unused', 'requirements.txt'),
+        ('pytest', 'unused', 'requirements.txt'),
+        ('yaml', 'missing', 'requirements.txt'),
+        ('pytest', 'dev_missing', 'requirements_dev.txt')
+    ]
@@ -0,0 +1,51 @@
+from get_requirements.policy import Policy, Decision, PolicyError, parse_policy, load_policy, decide
+from get_requirements.run import cli
+
+from os.path import join
+from unittest.mock import patch
+import sys
+import pytest
+
+def test_parse_policy():
+    assert parse_policy('missing=add, unused = keep,') == {'missing': 'add', 'unused': 'keep'}
+    with pytest.raises(PolicyError):
+        parse_policy('missing')
+
+def test_load_policy(tmp_path):
+    with open(join(tmp_path, 'pyproject.toml'), 'w') as f:
+        f.write('[tool.get_requirements.policy]\nmissing = "add"\nunused = "fail"\n')
+    assert load_policy(tmp_path) == Policy(missing='add', unused='fail')
+    assert load_policy(tmp_path, 'unused=remove') == Policy(missing='add', unused='remove')
+    assert load_policy(tmp_path, Policy(standard='remove'), batch=True) == Policy(
+        missing='add', unused='fail', standard='remove', dev_missing='keep', dev_unused='keep'
+    )
+    with pytest.raises(PolicyError, match='missing'):
+        load_policy(tmp_path, {'missing': 'remove'})
+    with pytest.raises(PolicyError, match='unknown'):
+        load_policy(tmp_path, {'unknown': 'keep'})
+    with open(join(tmp_path, 'pyproject.toml'), 'w') as f:
+        f.write('[tool.get_requirements.policy]\nunused = "add"\n')
+    with pytest.raises(PolicyError, match='unused'):
+        load_policy(tmp_path)
+
+def test_cli_invalid_policy(tmp_path):
+    with open(join(tmp_path, 'main.py'), 'w') as f:
+        f.write('import numpy\n')
+    with patch.object(sys, 'argv', ['get_requirements', '-f', str(tmp_path), '-dw', '-dwg', '-q', '-b', '-p', 'missing=remove']):
+        with pytest.raises(SystemExit) as e:
+            cli()
+    assert e.value.code == 1
+
+def test_decide():
+    decisions = [
+        Decision(package='a', category='missing', requirements_file='requirements.txt'),
+        Decision(package='b', category='unused', requirements_file='requirements.txt'),
+        Decision(package='c', category='dev_missing', requirements_file='requirements_dev.txt'),
+    ]
+    inputs = iter(['n'])
+    with patch('builtins.input', lambda: next(inputs)):
+        assert [(d.rule, d.action) for d in decide(decisions, Policy(missing='add', unused='keep'))] == [
+            ('add', 'added'), ('keep', 'maintained'), ('ask', 'not added')
+        ]
+    with pytest.raises(PolicyError, match='a .missing.*c .dev_missing'):
+        decide(decisions, Policy(missing='fail', dev_missing='fail'))
@@ -0,0 +1,41 @@
+from get_requirements.profiling import Profiler, profile_run, stage
+from get_requirements.scanner import scan_files, scan_file
+
+from json import load
+from os.path import dirname, join, exists
+from pstats import Stats
+import pytest
+
+mocks_folder = join(dirname(__file__), 'mocks')
+file_paths = [join(mocks_folder, 'test2', f) for f in ['main_test.py', 'test2.py', 'test3.py', 'test5.py', 'test_main.py']]
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_scan_files_profiler(jobs):
+    profiler = Profiler(slowest=3)
+    assert list(scan_files(file_paths, jobs=jobs, chunk_size=2, profiler=profiler)) == [(f, scan_file(f)) for f in file_paths]
+    summary = profiler.summary()
+    assert summary['counters'] == {'files': 5, 'bytes': sum(len(open(f, 'rb').read()) for f in file_paths), 'imports': 8}
+    assert sorted(summary['stages']) == ['extraction', 'read']
+    assert len(summary['slowest_files']) == 3
+    assert summary['slowest_files'][0]['seconds'] >= summary['slowest_files'][-1]['seconds']
+
+def test_stage():
+    profiler = Profiler()
+    with stage(profiler, 'discovery'):
+        pass
+    with stage(None, 'discovery'):
+        pass
+    assert list(profiler.stages) == ['discovery']
+
+def test_profile_run(tmp_path):
+    with profile_run(None) as profiler:
+        assert profiler is None
+    with profile_run(join(tmp_path, 'profile.json')) as profiler:
+        with profiler.stage('scan'):
+            list(scan_files(file_paths, profiler=profiler))
+    with open(join(tmp_path, 'profile.json')) as f:
+        assert load(f)['counters']['files'] == 5
+    with profile_run(join(tmp_path, 'profile.prof')) as profiler:
+        list(scan_files(file_paths, profiler=profiler))
+    assert exists(join(tmp_path, 'profile.prof'))
+    assert Stats(join(tmp_path, 'profile.prof')).total_calls > 0
@@ -0,0 +1,41 @@
+from get_requirements import reader
+from get_requirements.reader import read_source
+
+from os.path import join
+
+source = b'''"""
+def not_the_end():
+"""
+import os
+from typing import (
+    Any,
+)
+
+@decorator
+def main():
+    import json
+    return json.dumps({})
+
+class A:
+    pass
+'''
+
+def write(folder, data):
+    file_path = join(folder, 'module.py')
+    with open(file_path, 'wb') as f:
+        f.write(data)
+    return file_path
+
+def test_read_source(tmp_path):
+    file_path = write(tmp_path, source)
+    assert read_source(file_path) == source
+    assert read_source(file_path, header_only=True) == source[:source.index(b'@decorator')]
+
+def test_read_source_mmap(tmp_path, monkeypatch):
+    monkeypatch.setattr(reader, 'MMAP_THRESHOLD', 10)
+    file_path = write(tmp_path, source)
+    assert read_source(file_path) == source[:source.index(b'    return json')]
+    file_path = write(tmp_path, b'x = 1\n' * 1000)
+    assert read_source(file_path) == b''
+    file_path = write(tmp_path, b'from a import (\n    b,\n)\nx = 1\n')
+    assert read_source(file_path) == b'from a import (\n    b,\n)\n'
@@ -0,0 +1,51 @@
+from get_requirements.run import get_requirements, cli
+from get_requirements.report import format_report, render_report, report_dict, load_report_template
+
+from json import loads
+from os.path import dirname, join
+from unittest.mock import patch
+import sys
+import pytest
+
+mocks_folder = join(dirname(__file__), 'mocks')
+
+@pytest.fixture
+def pi():
+    return get_requirements(
+        folder_path=join(mocks_folder, 'test2'),
+        write_requirements_file=False,
+        write_requirements_generated=False,
+        policy='missing=add',
+        batch=True,
+        report_format=None
+    )
+
+def test_lazy_text_report(pi):
+    assert pi.report == ''
+    report = render_report(pi, join(mocks_folder, 'test2'))
+    assert '--fake_module_2: added' in report and '--typing(standard python module): maintained' in report
+    assert format_report(pi, join(mocks_folder, 'test2')) == report
+    assert load_report_template.cache_info().currsize == 1
+
+def test_json_report(pi):
+    report = loads(format_report(pi, join(mocks_folder, 'test2'), 'json'))
+    assert report == report_dict(pi, join(mocks_folder, 'test2'))
+    assert report['new_requirements_packages'] == ['custom_module', 'fake_module_2', 'fake_module_3', 'oxe', 'typing']
+    fake_module_2 = [p for p in report['packages'] if p['package'] == 'fake_module_2'][0]
+    assert fake_module_2['files'] == [join(mocks_folder, 'test2', 'test2.py'), join(mocks_folder, 'test2', 'test5.py')]
+    assert [(d['category'], d['action']) for d in fake_module_2['decisions']] == [('missing', 'added')]
+
+def test_jsonl_report(pi):
+    lines = [loads(line) for line in format_report(pi, join(mocks_folder, 'test2'), 'jsonl').splitlines()]
+    assert lines == report_dict(pi, join(mocks_folder, 'test2'))['packages']
+    with pytest.raises(ValueError):
+        format_report(pi, join(mocks_folder, 'test2'), 'xml')
+
+def test_cli_json_stdout(tmp_path, capsys):
+    with open(join(tmp_path, 'main.py'), 'w') as f:
+        f.write('import numpy\n')
+    with patch.object(sys, 'argv', ['get_requirements', '-f', str(tmp_path), '-dw', '-dwg', '-b', '-c', '-nr', '--format', 'json']):
+        cli()
+    out, err = capsys.readouterr()
+    assert [p['package'] for p in loads(out)['packages']] == ['numpy']
+    assert 'Scan cache' in err
@@ -1,4 +1,5 @@
 from get_requirements.run import get_requirements, get_modules_needed_to_install, PackagesInfo, Package, cli
+from get_requirements.policy import Decision, PolicyError
 
 from os.path import dirname, join, exists
 from os import remove
@@ -46,6 +47,19 @@ def packages_in_files():
         ),
     }
 
+@pytest.fixture
+def mocks_decisions():
+    return [
+        Decision(package='custom_module', category='missing', requirements_file='requirements.txt', action='added'),
+        Decision(package='fake_module_2', category='missing', requirements_file='requirements.txt', action='added'),
+        Decision(package='fake_module_3', category='missing', requirements_file='requirements.txt', action='added'),
+        Decision(package='cli_pprinter', category='dev_missing', requirements_file='requirements_dev.txt', action='added'),
+        Decision(package='custom_module', category='dev_missing', requirements_file='requirements_dev.txt', action='added'),
+        Decision(package='fake_module_2', category='dev_missing', requirements_file='requirements_dev.txt', action='added'),
+        Decision(package='fake_module_3', category='dev_missing', requirements_file='requirements_dev.txt', action='added'),
+        Decision(package='file_handler', category='dev_missing', requirements_file='requirements_dev.txt', action='added'),
+    ]
+
 def test_get_modules_needed_to_install(packages_in_files):
     assert get_modules_needed_to_install(
         folder_path=mh.mocks_folder,
@@ -93,10 +107,20 @@ def test_test2_folder(packages_in_files):
         packages_in_files=packages_in_files,
         new_requirements_packages={'custom_module', 'fake_module_2', 'fake_module_3'},
         new_requirements_dev_packages={'custom_module', 'fake_module_2', 'fake_module_3', 'cli_pprinter', 'file_handler'},
-        report=mh.load_from_mocks_folder(join('test2', 'report_expected'), extension='txt').format(folder_path=join(mh.mocks_folder, 'test2'))
+        report=mh.load_from_mocks_folder(join('test2', 'report_expected'), extension='txt').format(folder_path=join(mh.mocks_folder, 'test2')),
+        decisions=[
+            Decision(package='oxe', category='unused', requirements_file='requirements.txt', action='removed'),
+            Decision(package='typing', category='standard', requirements_file='requirements.txt', action='removed'),
+            Decision(package='fake_module_2', category='missing', requirements_file='requirements.txt', action='added'),
+            Decision(package='fake_module_3', category='missing', requirements_file='requirements.txt', action='added'),
+            Decision(package='cli_pprinter', category='dev_missing', requirements_file='requirements_dev.txt', action='added'),
+            Decision(package='custom_module', category='dev_missing', requirements_file='requirements_dev.txt', action='added'),
+            Decision(package='fake_module_3', category='dev_missing', requirements_file='requirements_dev.txt', action='added'),
+            Decision(package='file_handler', category='dev_missing', requirements_file='requirements_dev.txt', action='added'),
+        ]
     )
     
-def test_mocks_folder(packages_in_files):
+def test_mocks_folder(packages_in_files, mocks_decisions):
     inputs = iter(["y"] * 8)
     with patch('builtins.input', lambda: next(inputs)):
         result = get_requirements(
@@ -110,11 +134,12 @@ def test_mocks_folder(packages_in_files):
         packages_in_files=packages_in_files,
         new_requirements_packages={'custom_module', 'fake_module_2', 'fake_module_3'},
         new_requirements_dev_packages={'custom_module', 'fake_module_2', 'fake_module_3', 'cli_pprinter', 'file_handler'},
-        report=mh.load_from_mocks_folder('report_expected', extension='txt').format(folder_path=mh.mocks_folder)
+        report=mh.load_from_mocks_folder('report_expected', extension='txt').format(folder_path=mh.mocks_folder),
+        decisions=mocks_decisions
     )
     
     
-def test_cli(packages_in_files):
+def test_cli(packages_in_files, mocks_decisions):
     inputs = iter(["y"] * 16)
     requirements_file = join(mh.mocks_folder, 'requirements.txt')
     requirements_dev_file = join(mh.mocks_folder, 'requirements_dev.txt')
@@ -131,7 +156,8 @@ def test_cli(packages_in_files):
         packages_in_files=packages_in_files,
         new_requirements_packages={'custom_module', 'fake_module_2', 'fake_module_3'},
         new_requirements_dev_packages={'custom_module', 'fake_module_2', 'fake_module_3', 'cli_pprinter', 'file_handler'},
-        report=mh.load_from_mocks_folder('report_expected', extension='txt').format(folder_path=mh.mocks_folder)
+        report=mh.load_from_mocks_folder('report_expected', extension='txt').format(folder_path=mh.mocks_folder),
+        decisions=mocks_decisions
     )
     assert not exists(requirements_file)
     with patch.object(sys, 'argv', ['run.py', '-f', mh.mocks_folder]):
@@ -143,9 +169,32 @@ def test_cli(packages_in_files):
         packages_in_files=packages_in_files,
         new_requirements_packages={'custom_module', 'fake_module_2', 'fake_module_3'},
         new_requirements_dev_packages={'custom_module', 'fake_module_2', 'fake_module_3', 'cli_pprinter', 'file_handler'},
-        report=mh.load_from_mocks_folder('report_expected', extension='txt').format(folder_path=mh.mocks_folder)
+        report=mh.load_from_mocks_folder('report_expected', extension='txt').format(folder_path=mh.mocks_folder),
+        decisions=mocks_decisions
     )
     assert exists(requirements_file)
     remove(requirements_file)
     assert exists(requirements_dev_file)
-    remove(requirements_dev_file)
\ No newline at end of file
+    remove(requirements_dev_file)
+
+def test_test2_folder_policy():
+    folder_path = join(mh.mocks_folder, 'test2')
+    result = get_requirements(
+        folder_path=folder_path,
+        write_requirements_file=False,
+        write_requirements_generated=False,
+        policy='missing=add,unused=keep,standard=remove',
+        batch=True
+    )
+    assert result.new_requirements_packages == {'custom_module', 'oxe', 'fake_module_2', 'fake_module_3'}
+    assert result.new_requirements_dev_packages == {'fake_module_2'}
+    assert [(d.package, d.rule, d.action) for d in result.decisions][:4] == [
+        ('oxe', 'keep', 'maintained'), ('typing', 'remove', 'removed'), ('fake_module_2', 'add', 'added'), ('fake_module_3', 'add', 'added')
+    ]
+    with pytest.raises(PolicyError):
+        get_requirements(
+            folder_path=folder_path,
+            write_requirements_file=False,
+            write_requirements_generated=False,
+            policy={'missing': 'fail', 'dev_missing': 'fail'}
+        )
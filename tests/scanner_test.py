@@ -0,0 +1,22 @@
+from get_requirements.scanner import scan_files, scan_file, get_modules_in_file
+
+from os.path import dirname, join
+import pytest
+
+mocks_folder = join(dirname(__file__), 'mocks')
+file_paths = [join(mocks_folder, 'test2', f) for f in ['main_test.py', 'test2.py', 'test3.py', 'test5.py', 'test_main.py']] * 20
+
+def test_get_modules_in_file():
+    assert get_modules_in_file(join(mocks_folder, 'test2', 'test3.py')) == ['fake_module_3', 'json', 'custom_module']
+    assert get_modules_in_file(join(mocks_folder, 'test1', 'test1.py')) == []
+
+@pytest.mark.parametrize('executor', ['serial', 'thread', 'process'])
+def test_scan_files_keeps_order(executor):
+    expected = [(f, scan_file(f)) for f in file_paths]
+    assert list(scan_files(iter(file_paths), jobs=3, executor=executor, chunk_size=7)) == expected
+
+def test_scan_files_invalid_args():
+    with pytest.raises(ValueError):
+        list(scan_files(file_paths, executor='gpu'))
+    with pytest.raises(ValueError):
+        list(scan_files(file_paths, jobs=-1))
@@ -0,0 +1,56 @@
+from get_requirements.walker import walk_py_files, is_walked
+
+from os import makedirs, walk
+from os.path import dirname, join
+
+mocks_folder = join(dirname(__file__), 'mocks')
+
+def make_tree(folder, file_paths):
+    for file_path in file_paths:
+        makedirs(dirname(join(folder, file_path)), exist_ok=True)
+        with open(join(folder, file_path), 'w') as f:
+            f.write('')
+
+def test_walk_mocks_folder():
+    assert list(walk_py_files(mocks_folder)) == [
+        join(mocks_folder, 'test1', 'test1.py'),
+        join(mocks_folder, 'test2', 'main_test.py'),
+        join(mocks_folder, 'test2', 'test2.py'),
+        join(mocks_folder, 'test2', 'test3.py'),
+        join(mocks_folder, 'test2', 'test5.py'),
+        join(mocks_folder, 'test2', 'test_main.py'),
+    ]
+    assert list(walk_py_files(join(mocks_folder, 'test1', 'test1.py'))) == []
+
+def test_walk_excludes(tmp_path):
+    make_tree(tmp_path, [
+        'main.py', 'notes.txt', '.hidden.py', '.git/hook.py', '__pycache__/main.py', 'build/lib.py', 'env/pyvenv.cfg', 'env/lib.py',
+        'pkg/__init__.py', 'pkg/module_pb2.py', 'pkg/generated/big.py', 'pkg/sub/module.py', 'pkg/sub/keep.py', 'pkg/sub/tmp.py'
+    ])
+    with open(join(tmp_path, '.gitignore'), 'w') as f:
+        f.write('# comment\n*.py\n!pkg/**\n/pkg/generated/\n!/main.py\n')
+    with open(join(tmp_path, 'pkg', 'sub', '.gitignore'), 'w') as f:
+        f.write('tmp.py\n')
+    assert [p[len(str(tmp_path)) + 1:] for p in walk_py_files(tmp_path, excludes=['*_pb2.py', 'pkg/sub/module.py'])] == [
+        'main.py', join('pkg', '__init__.py'), join('pkg', 'sub', 'keep.py')
+    ]
+    assert [p[len(str(tmp_path)) + 1:] for p in walk_py_files(tmp_path, use_default_excludes=False, use_gitignore=False)] == [
+        join('__pycache__', 'main.py'), join('build', 'lib.py'), 'main.py', join('pkg', '__init__.py'), join('pkg', 'generated', 'big.py'),
+        join('pkg', 'module_pb2.py'), join('pkg', 'sub', 'keep.py'), join('pkg', 'sub', 'module.py'), join('pkg', 'sub', 'tmp.py')
+    ]
+
+def test_is_walked(tmp_path):
+    make_tree(tmp_path, [
+        'main.py', 'notes.txt', '.hidden.py', '.git/hook.py', '__pycache__/main.py', 'build/lib.py', 'env/pyvenv.cfg', 'env/lib.py',
+        'pkg/__init__.py', 'pkg/module_pb2.py', 'pkg/generated/big.py', 'pkg/sub/module.py', 'pkg/sub/keep.py', 'pkg/sub/tmp.py'
+    ])
+    with open(join(tmp_path, 'pkg', 'sub', '.gitignore'), 'w') as f:
+        f.write('tmp.py\n')
+    folders = []
+    walked = list(walk_py_files(tmp_path, excludes=['*_pb2.py'], folders=folders))
+    all_paths = [join(root, name) for root, dirs, files in walk(tmp_path) for name in dirs + files]
+    assert [p for p in sorted(all_paths) if is_walked(tmp_path, p, excludes=['*_pb2.py']) and p.endswith('.py')] == sorted(walked)
+    assert [p for p in sorted(all_paths) if is_walked(tmp_path, p, excludes=['*_pb2.py']) and not p.endswith('.py')] == sorted(folders[1:])
+    assert folders[0] == tmp_path and is_walked(tmp_path, tmp_path)
+    assert not is_walked(tmp_path, join(tmp_path, 'pkg', 'missing.py'))
+    assert not is_walked(join(tmp_path, 'pkg'), join(tmp_path, 'main.py'))
@@ -0,0 +1,88 @@
+from get_requirements.watch import WatchSession, PollingWatcher, make_watcher, watch
+
+from os import makedirs, remove
+from os.path import join
+from shutil import rmtree
+from unittest.mock import patch
+
+def write(file_path, text):
+    with open(file_path, 'w') as f:
+        f.write(text)
+
+def packages(session):
+    return {k:(sorted(v.files), v.is_on_standard_files) for k,v in session.pi.packages_in_files.items()}
+
+def test_watch_session(tmp_path):
+    folder = str(tmp_path)
+    makedirs(join(folder, 'pkg'))
+    write(join(folder, 'pkg', 'a.py'), 'import yaml\nimport os\n')
+    write(join(folder, 'pkg', 'b.py'), 'import numpy\n')
+    write(join(folder, 'pkg', 'b_test.py'), 'import yaml\n')
+    write(join(folder, 'requirements.txt'), 'numpy\nrequests')
+    session = WatchSession(folder, join(folder, 'requirements.txt'), join(folder, 'requirements_dev.txt'), resolve_distributions=False)
+    assert session.update({folder}) == 3
+    assert packages(session) == {
+        'yaml': ([join(folder, 'pkg', 'a.py'), join(folder, 'pkg', 'b_test.py')], True),
+        'os': ([join(folder, 'pkg', 'a.py')], True),
+        'numpy': ([join(folder, 'pkg', 'b.py')], True),
+        'requests': ([], False)
+    }
+    assert session.emit()
+    assert not session.emit()
+    remove(join(folder, 'pkg', 'a.py'))
+    assert session.update({join(folder, 'pkg', 'a.py')}) == 1
+    assert packages(session) == {'yaml': ([join(folder, 'pkg', 'b_test.py')], False), 'numpy': ([join(folder, 'pkg', 'b.py')], True), 'requests': ([], False)}
+    write(join(folder, 'pkg', 'b.py'), 'import requests\n')
+    assert session.update({join(folder, 'pkg', 'b.py')}) == 1
+    assert packages(session) == {'yaml': ([join(folder, 'pkg', 'b_test.py')], False), 'numpy': ([], False), 'requests': ([join(folder, 'pkg', 'b.py')], True)}
+    write(join(folder, 'requirements.txt'), 'requests')
+    assert session.update({join(folder, 'requirements.txt')}) == 0
+    assert packages(session) == {'yaml': ([join(folder, 'pkg', 'b_test.py')], False), 'requests': ([join(folder, 'pkg', 'b.py')], True)}
+    rmtree(join(folder, 'pkg'))
+    assert session.update({join(folder, 'pkg')}) == 2
+    assert packages(session) == {'requests': ([], False)}
+    assert session.emit(policy='unused=remove', write_requirements_file=True)
+    with open(join(folder, 'requirements.txt')) as f:
+        assert f.read() == ''
+
+def test_watch_session_local_modules(tmp_path):
+    folder = str(tmp_path)
+    write(join(folder, 'main.py'), 'import custom_module\n')
+    session = WatchSession(folder, join(folder, 'requirements.txt'), join(folder, 'requirements_dev.txt'), resolve_distributions=False)
+    assert session.update({folder}) == 1
+    assert packages(session) == {'custom_module': ([join(folder, 'main.py')], True)}
+    write(join(folder, 'custom_module.py'), 'import requests\n')
+    assert session.update({join(folder, 'custom_module.py')}) == 2
+    assert packages(session) == {'requests': ([join(folder, 'custom_module.py')], True)}
+    assert session.graph.files_pulling_in('requests') == [join(folder, 'custom_module.py'), join(folder, 'main.py')]
+    remove(join(folder, 'custom_module.py'))
+    assert session.update({join(folder, 'custom_module.py')}) == 2
+    assert packages(session) == {'custom_module': ([join(folder, 'main.py')], True)}
+
+def test_polling_watcher(tmp_path):
+    folder = str(tmp_path)
+    write(join(folder, 'a.py'), 'import x\n')
+    watcher = PollingWatcher(folder, [join(folder, 'requirements.txt')], interval=0.01)
+    assert watcher.wait(0.05) == set()
+    write(join(folder, 'a.py'), 'import yy\n')
+    write(join(folder, 'requirements.txt'), 'yy')
+    assert watcher.wait(1) == {join(folder, 'a.py'), join(folder, 'requirements.txt')}
+    remove(join(folder, 'a.py'))
+    assert watcher.wait(1) == {join(folder, 'a.py')}
+
+def test_make_watcher(tmp_path):
+    watcher = make_watcher(str(tmp_path))
+    write(join(tmp_path, 'a.py'), 'import x\n')
+    assert join(tmp_path, 'a.py') in watcher.wait(1)
+    watcher.close()
+    assert isinstance(make_watcher(str(tmp_path), use_polling=True), PollingWatcher)
+
+def test_watch(tmp_path):
+    folder = str(tmp_path)
+    write(join(folder, 'a.py'), 'import numpy\n')
+    with patch('get_requirements.watch.PollingWatcher.wait', side_effect=[{join(folder, 'a.py')}, set()]):
+        write(join(folder, 'a.py'), 'import numpy\nimport pandas\n')
+        pi = watch(folder, use_polling=True, max_updates=1, policy='missing=add,dev_missing=add', write_requirements_file=True, resolve_distributions=False)
+    assert sorted(pi.packages_in_files) == ['numpy', 'pandas']
+    with open(join(folder, 'requirements.txt')) as f:
+        assert f.read() == 'numpy\npandas'